@@ -15,7 +15,9 @@ References:
 """
 
 import logging
+import re
 import time
+from functools import lru_cache
 from typing import Any, Dict, Optional, Tuple
 
 from audit_service import (
@@ -26,12 +28,19 @@ from audit_service import (
     AuditEvent,
 )
 
+# Hook debug lines pass %-style args so nothing is formatted per tool call
+# unless DEBUG logging is enabled
 logger = logging.getLogger(__name__)
 
 # Store context for correlating PreToolUse with PostToolUse
 # Key: tool_use_id, Value: (start_time, tool_name, user_id, session_id, tool_input)
 _tool_execution_context: Dict[str, Tuple[float, str, str, str, Dict[str, Any]]] = {}
 
+# Common error indicators in plain-text tool output. Case-insensitive search
+# scans the response once and stops at the first hit, without lowercasing
+# a copy of the (possibly very large) output.
+_ERROR_INDICATOR_RE = re.compile(r"error|failed", re.IGNORECASE)
+
 
 def create_audit_hooks(user_id: str, session_id: str, org_id: Optional[str] = None, project_id: Optional[str] = None):
     """
@@ -65,7 +74,7 @@ def create_audit_hooks(user_id: str, session_id: str, org_id: Optional[str] = No
         if tool_use_id:
             _tool_execution_context[tool_use_id] = (time.time(), tool_name, user_id, session_id, tool_input)
 
-        logger.debug(f"📝 Audit: PreToolUse context stored - {tool_name} (id: {tool_use_id})")
+        logger.debug("📝 Audit: PreToolUse context stored - %s (id: %s)", tool_name, tool_use_id)
 
         # Return empty to allow the operation (don't modify behavior)
         return {}
@@ -100,7 +109,7 @@ def create_audit_hooks(user_id: str, session_id: str, org_id: Optional[str] = No
         if isinstance(tool_response, str):
             result_preview = tool_response[:500] if len(tool_response) > 500 else tool_response
             # Check for common error indicators
-            if 'error' in tool_response.lower() or 'failed' in tool_response.lower():
+            if _ERROR_INDICATOR_RE.search(tool_response):
                 is_error = True
                 error_message = result_preview
         elif isinstance(tool_response, dict):
@@ -126,7 +135,7 @@ def create_audit_hooks(user_id: str, session_id: str, org_id: Optional[str] = No
             project_id=project_id,
         )
 
-        logger.debug(f"📝 Audit: PostToolUse logged - {tool_name} (success={not is_error}, {duration_ms}ms)")
+        logger.debug("📝 Audit: PostToolUse logged - %s (success=%s, %sms)", tool_name, not is_error, duration_ms)
 
         return {}
 
@@ -143,7 +152,7 @@ def create_audit_hooks(user_id: str, session_id: str, org_id: Optional[str] = No
 
         # Log is already done in agent_task before SDK is called
         # This hook can add additional context if needed
-        logger.debug(f"📝 Audit: UserPromptSubmit - {len(prompt)} chars")
+        logger.debug("📝 Audit: UserPromptSubmit - %d chars", len(prompt))
 
         return {}
 
@@ -171,7 +180,7 @@ def create_audit_hooks(user_id: str, session_id: str, org_id: Optional[str] = No
             metadata={"stop_hook_active": stop_hook_active},
         ))
 
-        logger.debug(f"📝 Audit: Stop logged - session {session_id}")
+        logger.debug("📝 Audit: Stop logged - session %s", session_id)
 
         return {}
 
@@ -185,10 +194,14 @@ def create_audit_hooks(user_id: str, session_id: str, org_id: Optional[str] = No
     }
 
 
+@lru_cache(maxsize=256)
 def build_hooks_config(user_id: str, session_id: str, org_id: Optional[str] = None, project_id: Optional[str] = None):
     """
     Build hooks configuration dict for ClaudeAgentOptions.
 
+    Memoized per context: the hooks are stateless closures and the SDK only
+    reads the config, so every message in a session reuses one instance.
+
     Usage:
         from audit_hooks import build_hooks_config
         from claude_agent_sdk import ClaudeAgentOptions, HookMatcher
@@ -34,15 +34,16 @@ import uuid
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 from queue import Queue
 import threading
 
 # Import database utility
 try:
-    from .database_util import get_db_connection, execute_query
+    from .database_util import get_db_connection, execute_values_query
 except ImportError:
-    from database_util import get_db_connection, execute_query
+    from database_util import get_db_connection, execute_values_query
 
 logger = logging.getLogger(__name__)
 
@@ -106,7 +107,7 @@ class EventStatus(str, Enum):
 # Audit Event Data Class
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class AuditEvent:
     """
     Structured audit event following OWASP guidelines.
@@ -120,7 +121,7 @@ class AuditEvent:
     status: Union[EventStatus, str]
 
     # Auto-generated
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=lambda: uuid.uuid4().hex)  # UUID column accepts undashed hex
     event_time: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
     # Identity context
@@ -162,7 +163,7 @@ class AuditEvent:
     def event_category(self) -> str:
         """Extract category from event type"""
         event_str = self.event_type.value if isinstance(self.event_type, EventType) else str(self.event_type)
-        return event_str.split('.')[0]
+        return event_str.partition('.')[0]
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for storage"""
@@ -223,6 +224,21 @@ class DataSanitizer:
         (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[EMAIL]'),  # Email (optional)
     ]
 
+    # Compiled once: one alternation for all sensitive key substrings, and
+    # the value patterns paired with their replacements
+    _SENSITIVE_KEY_RE = re.compile(
+        "|".join(re.escape(k) for k in sorted(SENSITIVE_KEYS)), re.IGNORECASE
+    )
+    _COMPILED_PATTERNS = [(re.compile(p), r) for p, r in SENSITIVE_PATTERNS]
+
+    # Inline credentials in shell commands (see sanitize_tool_input)
+    _SHELL_PATTERNS = [
+        (re.compile(r'--password[=\s]+\S+'), '--password=[REDACTED]'),
+        (re.compile(r'-p\s*\S+'), '-p [REDACTED]'),
+        (re.compile(r'PGPASSWORD=\S+'), 'PGPASSWORD=[REDACTED]'),
+        (re.compile(r'AWS_SECRET_ACCESS_KEY=\S+'), 'AWS_SECRET_ACCESS_KEY=[REDACTED]'),
+    ]
+
     @classmethod
     def sanitize(cls, data: Any, max_depth: int = 10) -> Any:
         """
@@ -259,28 +275,30 @@ class DataSanitizer:
     @classmethod
     def _sanitize_value(cls, key: str, value: Any, max_depth: int) -> Any:
         """Sanitize a value based on its key"""
-        key_lower = key.lower()
-
         # Check if key is sensitive
-        for sensitive_key in cls.SENSITIVE_KEYS:
-            if sensitive_key in key_lower:
-                if isinstance(value, str) and len(value) > 0:
-                    return f"[REDACTED:{len(value)} chars]"
-                return "[REDACTED]"
+        if cls._SENSITIVE_KEY_RE.search(key):
+            if isinstance(value, str) and len(value) > 0:
+                return f"[REDACTED:{len(value)} chars]"
+            return "[REDACTED]"
 
         # Recursively sanitize
         return cls.sanitize(value, max_depth)
 
+    # Stored strings are cut to MAX_STRING_LENGTH. Redaction runs over the
+    # whole value first: each redaction shortens the text, so characters from
+    # past any pre-cut could shift into the stored part unscanned.
+    MAX_STRING_LENGTH = 10000
+
     @classmethod
     def _sanitize_string(cls, value: str) -> str:
         """Sanitize sensitive patterns in strings"""
         result = value
-        for pattern, replacement in cls.SENSITIVE_PATTERNS:
-            result = re.sub(pattern, replacement, result)
+        for pattern, replacement in cls._COMPILED_PATTERNS:
+            result = pattern.sub(replacement, result)
 
         # Truncate very long strings
-        if len(result) > 10000:
-            result = result[:10000] + f"... [TRUNCATED: {len(value)} chars total]"
+        if len(result) > cls.MAX_STRING_LENGTH:
+            result = result[:cls.MAX_STRING_LENGTH] + f"... [TRUNCATED: {len(value)} chars total]"
 
         return result
 
@@ -299,10 +317,8 @@ class DataSanitizer:
             if 'command' in sanitized and isinstance(sanitized['command'], str):
                 cmd = sanitized['command']
                 # Redact inline credentials in commands
-                cmd = re.sub(r'--password[=\s]+\S+', '--password=[REDACTED]', cmd)
-                cmd = re.sub(r'-p\s*\S+', '-p [REDACTED]', cmd)
-                cmd = re.sub(r'PGPASSWORD=\S+', 'PGPASSWORD=[REDACTED]', cmd)
-                cmd = re.sub(r'AWS_SECRET_ACCESS_KEY=\S+', 'AWS_SECRET_ACCESS_KEY=[REDACTED]', cmd)
+                for pattern, replacement in cls._SHELL_PATTERNS:
+                    cmd = pattern.sub(replacement, cmd)
                 sanitized['command'] = cmd
 
         return sanitized
@@ -312,6 +328,42 @@ class DataSanitizer:
 # Audit Service
 # ============================================================
 
+# Batch insert statement pieces, built once at import time
+_AUDIT_INSERT_SQL = """
+    INSERT INTO agent_audit_logs (
+        event_id, event_time, event_type, event_category,
+        user_id, user_email, org_id, project_id, session_id, device_cert_id,
+        source_ip, user_agent, instance_id,
+        action, resource_type, resource_id, request_params,
+        status, error_code, error_message, response_data,
+        duration_ms, metadata
+    ) VALUES
+"""
+_AUDIT_ROW_PLACEHOLDER = "(" + ", ".join(["%s"] * 23) + ")"
+_AUDIT_ON_CONFLICT_SQL = " ON CONFLICT (event_id) DO NOTHING"
+_AUDIT_BATCH_SQL = _AUDIT_INSERT_SQL + "%s" + _AUDIT_ON_CONFLICT_SQL
+
+# Nil UUID fallback for user_id when not a valid UUID
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+
+def _sanitize_uuid(value: Optional[str]) -> Optional[str]:
+    """Convert empty strings to None for UUID fields."""
+    return None if value == '' else value
+
+
+@lru_cache(maxsize=1024)  # a batch repeats the same few session users
+def _sanitize_user_id(value: Optional[str]) -> str:
+    """Return value if it is a valid UUID, otherwise NIL_UUID."""
+    if not value:
+        return NIL_UUID
+    try:
+        uuid.UUID(value)
+        return value
+    except ValueError:
+        return NIL_UUID
+
+
 class AuditService:
     """
     Async audit logging service with batch writing.
@@ -385,17 +437,22 @@ class AuditService:
 
         logger.info(f"📝 Audit service stopped. Total logged: {self._events_logged}, dropped: {self._events_dropped}")
 
-    async def log(self, event: AuditEvent):
+    async def log(self, event: AuditEvent, request_params_sanitized: bool = False):
         """
         Log an audit event (async, non-blocking).
 
         Events are queued and batch-written to database.
+
+        Args:
+            event: Event to log
+            request_params_sanitized: True if the caller already ran
+                request_params through DataSanitizer (skips a second full walk)
         """
         if not self.enabled:
             return
 
         # Sanitize event data
-        if event.request_params:
+        if event.request_params and not request_params_sanitized:
             event.request_params = DataSanitizer.sanitize(event.request_params)
         if event.response_data:
             event.response_data = DataSanitizer.sanitize(event.response_data)
@@ -433,6 +490,13 @@ class AuditService:
 
                     async with self._buffer_lock:
                         self._buffer.append(event)
+                        # Drain whatever else is already queued in the same
+                        # wakeup instead of one loop iteration per event
+                        while len(self._buffer) < self.batch_size:
+                            try:
+                                self._buffer.append(self._queue.get_nowait())
+                            except asyncio.QueueEmpty:
+                                break
 
                 except asyncio.TimeoutError:
                     pass  # Timeout is expected, will trigger flush check
@@ -458,8 +522,9 @@ class AuditService:
             if not self._buffer:
                 return
 
-            events_to_write = self._buffer.copy()
-            self._buffer.clear()
+            # Hand the filled list to the writer and start a fresh one,
+            # rather than copying every event and clearing the original
+            events_to_write, self._buffer = self._buffer, []
 
         # Write batch to database
         try:
@@ -485,49 +550,8 @@ class AuditService:
         if not events:
             return
 
-        # Build batch insert query
-        query = """
-            INSERT INTO agent_audit_logs (
-                event_id, event_time, event_type, event_category,
-                user_id, user_email, org_id, project_id, session_id, device_cert_id,
-                source_ip, user_agent, instance_id,
-                action, resource_type, resource_id, request_params,
-                status, error_code, error_message, response_data,
-                duration_ms, metadata
-            ) VALUES
-        """
-
-        values_template = """(
-            %s, %s, %s, %s,
-            %s, %s, %s, %s, %s, %s,
-            %s, %s, %s,
-            %s, %s, %s, %s,
-            %s, %s, %s, %s,
-            %s, %s
-        )"""
-
-        values_list = []
-        params = []
-
-        # Helper to convert empty strings to None for UUID fields
-        def _sanitize_uuid(value: Optional[str]) -> Optional[str]:
-            return None if value == '' else value
-
-        # Nil UUID fallback for user_id when not a valid UUID
-        NIL_UUID = "00000000-0000-0000-0000-000000000000"
-
-        def _sanitize_user_id(value: Optional[str]) -> str:
-            if not value or value == '':
-                return NIL_UUID
-            try:
-                uuid.UUID(value)
-                return value
-            except ValueError:
-                return NIL_UUID
-
-        for event in events:
-            values_list.append(values_template)
-            params.extend([
+        rows = [
+            (
                 event.event_id,
                 event.event_time,
                 event.event_type.value if isinstance(event.event_type, EventType) else str(event.event_type),
@@ -551,12 +575,11 @@ class AuditService:
                 json.dumps(event.response_data) if event.response_data else None,
                 event.duration_ms,
                 json.dumps(event.metadata) if event.metadata else None,
-            ])
+            )
+            for event in events
+        ]
 
-        query += ', '.join(values_list)
-        query += " ON CONFLICT (event_id) DO NOTHING"
-
-        execute_query(query, tuple(params), fetch="none")
+        execute_values_query(_AUDIT_BATCH_SQL, rows, template=_AUDIT_ROW_PLACEHOLDER)
 
     # ============================================================
     # Convenience Methods
@@ -673,7 +696,7 @@ class AuditService:
             request_params=DataSanitizer.sanitize_tool_input(tool_name, tool_input),
             metadata={"tool_name": tool_name},
             **kwargs
-        ))
+        ), request_params_sanitized=True)
 
     async def log_tool_approved(
         self,
@@ -762,7 +785,7 @@ class AuditService:
             response_data=response_data,
             metadata=metadata,
             **kwargs
-        ))
+        ), request_params_sanitized=True)
 
     async def log_security_event(
         self,
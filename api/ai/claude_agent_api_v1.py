@@ -1,7 +1,9 @@
 import asyncio
+import itertools
 import json
 import logging
 import os
+import secrets
 import time
 import uuid
 from pathlib import Path
@@ -13,10 +15,9 @@ import config_loader
 config_loader.load_config()
 
 from asyncio import Lock
-from collections import defaultdict
+from collections import defaultdict, deque
 from contextlib import asynccontextmanager
-from datetime import datetime, timedelta
-from typing import Any, Dict
+from typing import Any, Dict, Set, Tuple
 from config import config
 
 from claude_agent_sdk import (
@@ -84,7 +85,7 @@ from routes_audit import router as audit_router
 
 # Import modular routes (split for better maintainability)
 from routes_sync import router as sync_router, set_mcp_cache
-from routes_mcp import router as mcp_router
+from routes_mcp import router as mcp_router, set_mcp_cache as set_mcp_routes_cache
 from routes_tools import router as tools_router
 from routes_memory import router as memory_router
 from routes_marketplace import router as marketplace_router
@@ -96,8 +97,32 @@ from incident_analytics import start_pgmq_consumer, stop_pgmq_consumer
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Track tool usage for demonstration
-tool_usage_log = []
+# Track recent tool usage for demonstration. Process-wide and fed by every
+# session, so keep only the most recent entries (each holds the full tool input)
+TOOL_USAGE_LOG_SIZE = 500
+tool_usage_log: deque = deque(maxlen=TOOL_USAGE_LOG_SIZE)
+
+# Permission request IDs: a per-process random prefix plus a counter, led by
+# the nanosecond timestamp so IDs sort by creation time in the audit log.
+_REQUEST_ID_PREFIX = secrets.token_hex(4)
+_request_id_counter = itertools.count()
+
+
+def _new_request_id() -> str:
+    """Return a unique, time-ordered ID for a permission request."""
+    return f"{time.time_ns():016x}-{_REQUEST_ID_PREFIX}-{next(_request_id_counter):x}"
+
+
+# Built-in tools that run without a permission prompt. Immutable and shared by
+# every session; each session copies them into its own allowed_tools list.
+BUILTIN_ALLOWED_TOOLS = (
+    "mcp__incident_tools__get_incidents_by_time",
+    "mcp__incident_tools__get_incidents_by_id",
+    "mcp__incident_tools__get_current_time",
+    "mcp__incident_tools__get_incident_stats",
+    "mcp__memory_tools__update_memory",
+)
+STREAMING_ALLOWED_TOOLS = BUILTIN_ALLOWED_TOOLS + ("Skill",)
 
 
 def sanitize_error_message(error: Exception, context: str = "") -> str:
@@ -135,6 +160,23 @@ def sanitize_error_message(error: Exception, context: str = "") -> str:
 # Credential Export to Agent Env
 # ==========================================
 
+# Max concurrent Vault detail lookups when exporting credentials to the agent
+VAULT_FETCH_CONCURRENCY = int(os.getenv("VAULT_FETCH_CONCURRENCY", "5"))
+
+# Max seconds any single session-setup lookup (MCP servers, plugins, allowed
+# tools, Vault credentials) may take before the session starts without it
+SESSION_LOOKUP_TIMEOUT = float(os.getenv("SESSION_LOOKUP_TIMEOUT", "10"))
+
+
+async def with_lookup_budget(awaitable, default, name: str):
+    """Await a session-setup lookup, returning `default` if it overruns its budget."""
+    try:
+        return await asyncio.wait_for(awaitable, SESSION_LOOKUP_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"⏱️  {name} timed out after {SESSION_LOOKUP_TIMEOUT}s - continuing without it")
+        return default
+
+
 async def load_exported_credentials(user_id: str, project_id: str = None) -> Dict[str, str]:
     """
     Load all credentials marked as export_to_agent=True from Vault.
@@ -160,8 +202,10 @@ async def load_exported_credentials(user_id: str, project_id: str = None) -> Dic
     Returns:
         Dict mapping env var names to resolved values
     """
+    # hvac is synchronous (every call is an HTTP round-trip to Vault), so each
+    # Vault call runs in a worker thread to keep the event loop responsive
     vault = vault_client.get_vault_client()
-    if not vault.is_available():
+    if not await asyncio.to_thread(vault.is_available):
         logger.debug("Vault not available, skipping credential export")
         return {}
 
@@ -182,36 +226,26 @@ async def load_exported_credentials(user_id: str, project_id: str = None) -> Dic
                 # Continue to load user-scoped credentials only
             else:
                 logger.info(f"✅ Authorization passed: User {user_id} has role {role} in project {project_id}")
-                credentials = vault_client.list_project_credentials(project_id)
-                for cred in credentials:
-                    cred_type = cred.get("type", "")
-                    cred_name = cred.get("name", "")
-
-                    cred_detail = vault_client.get_project_credential(
-                        project_id=project_id,
-                        credential_type=cred_type,
-                        credential_name=cred_name
-                    )
+                credentials = await asyncio.to_thread(vault_client.list_project_credentials, project_id)
+                details = await _fetch_credential_details(
+                    vault_client.get_project_credential, credentials, project_id=project_id
+                )
+                for cred, cred_detail in zip(credentials, details):
                     if not cred_detail:
                         continue
 
-                    _resolve_credential_env(cred_detail, cred_name, exported_env)
+                    _resolve_credential_env(cred_detail, cred.get("name", ""), exported_env)
 
         # Fall back to user-scoped credentials (backward compat)
-        user_credentials = vault_client.list_credentials(user_id)
-        for cred in user_credentials:
-            cred_type = cred.get("type", "")
-            cred_name = cred.get("name", "")
-
-            cred_detail = vault_client.get_credential(
-                user_id=user_id,
-                credential_type=cred_type,
-                credential_name=cred_name
-            )
+        user_credentials = await asyncio.to_thread(vault_client.list_credentials, user_id)
+        details = await _fetch_credential_details(
+            vault_client.get_credential, user_credentials, user_id=user_id
+        )
+        for cred, cred_detail in zip(user_credentials, details):
             if not cred_detail:
                 continue
 
-            _resolve_credential_env(cred_detail, cred_name, exported_env)
+            _resolve_credential_env(cred_detail, cred.get("name", ""), exported_env)
 
         if exported_env:
             logger.info(
@@ -226,6 +260,26 @@ async def load_exported_credentials(user_id: str, project_id: str = None) -> Dic
         return {}
 
 
+async def _fetch_credential_details(fetch, credentials: list, **scope) -> list:
+    """
+    Fetch credential details from Vault with at most VAULT_FETCH_CONCURRENCY
+    requests in flight. Results are returned in the order of `credentials`
+    so env var precedence matches the sequential lookup.
+    """
+    semaphore = asyncio.Semaphore(VAULT_FETCH_CONCURRENCY)
+
+    async def fetch_one(cred: dict):
+        async with semaphore:
+            return await asyncio.to_thread(
+                fetch,
+                credential_type=cred.get("type", ""),
+                credential_name=cred.get("name", ""),
+                **scope,
+            )
+
+    return await asyncio.gather(*(fetch_one(cred) for cred in credentials))
+
+
 def _resolve_credential_env(cred_detail: dict, cred_name: str, exported_env: Dict[str, str]):
     """Resolve env mappings from a credential detail into exported_env dict."""
     metadata = cred_detail.get("metadata", {})
@@ -253,12 +307,81 @@ def _resolve_credential_env(cred_detail: dict, cred_name: str, exported_env: Dic
             )
 
 
+def merge_user_mcp_servers(mcp_servers: Dict[str, Any], user_mcp_servers: Dict[str, Any]):
+    """
+    Add user MCP servers to the built-in ones without letting them shadow a built-in.
+
+    Built-in SDK servers (incident_tools, memory_tools) are tenant-scoped and their
+    tools are pre-approved in allowed_tools, so a user server reusing one of those
+    names must not replace them.
+    """
+    if not user_mcp_servers:
+        return
+
+    shadowed = mcp_servers.keys() & user_mcp_servers.keys()
+    if shadowed:
+        logger.warning(f"⚠️ Ignoring user MCP servers that shadow built-in servers: {sorted(shadowed)}")
+        user_mcp_servers = {
+            name: cfg for name, cfg in user_mcp_servers.items() if name not in shadowed
+        }
+
+    mcp_servers.update(user_mcp_servers)
+
+
+# Strong references to fire-and-forget persistence tasks (the event loop only
+# keeps weak references, so an untracked task can be garbage collected mid-write)
+_background_writes: Set[asyncio.Task] = set()
+
+
+def persist_in_background(coro) -> asyncio.Task:
+    """Run a persistence coroutine without holding up the response stream."""
+    task = asyncio.create_task(coro)
+    _background_writes.add(task)
+    task.add_done_callback(_background_writes.discard)
+    return task
+
+
+# conversation_id -> its latest background message write. The next message of
+# that conversation waits for it, so created_at (which orders history) keeps
+# turn order even though "complete" is sent before the write lands
+_pending_message_writes: Dict[str, asyncio.Task] = {}
+
+
+def save_message_in_background(conversation_id: str, **kwargs) -> asyncio.Task:
+    """Save a message off the response path; see save_message_in_order."""
+    task = persist_in_background(save_message(conversation_id=conversation_id, **kwargs))
+    _pending_message_writes[conversation_id] = task
+
+    def _clear(done: asyncio.Task):
+        if _pending_message_writes.get(conversation_id) is done:
+            del _pending_message_writes[conversation_id]
+
+    task.add_done_callback(_clear)
+    return task
+
+
+async def save_message_in_order(conversation_id: str, **kwargs) -> bool:
+    """Save a message once the conversation's pending background write is done."""
+    pending = _pending_message_writes.get(conversation_id)
+    if pending is not None:
+        # wait() rather than await: a cancelled caller must not cancel the write
+        await asyncio.wait({pending})
+    return await save_message(conversation_id=conversation_id, **kwargs)
+
+
+async def drain_background_writes():
+    """Wait for in-flight persistence tasks (called at shutdown)."""
+    if _background_writes:
+        logger.info(f"💾 Waiting for {len(_background_writes)} pending message writes...")
+        await asyncio.wait(set(_background_writes))
+
+
 # ==========================================
 # Rate Limiting
 # ==========================================
 
-# Rate limiter storage: {user_id: [(timestamp, count), ...]}
-rate_limit_storage = defaultdict(list)
+# Rate limiter storage: {user_id: deque of request timestamps, oldest first}
+rate_limit_storage = defaultdict(deque)
 rate_limit_lock = Lock()
 
 # Get rate limit from environment (default: 60 requests per minute)
@@ -277,25 +400,25 @@ async def check_rate_limit(user_id: str) -> bool:
         True if within rate limit, False if exceeded
     """
     async with rate_limit_lock:
-        now = datetime.now()
-        window_start = now - timedelta(seconds=RATE_LIMIT_WINDOW)
+        now = time.monotonic()
+        window_start = now - RATE_LIMIT_WINDOW
+        timestamps = rate_limit_storage[user_id]
 
-        # Clean up old entries
-        rate_limit_storage[user_id] = [
-            timestamp for timestamp in rate_limit_storage[user_id]
-            if timestamp > window_start
-        ]
+        # Clean up old entries - timestamps are appended in order, so only
+        # the expired prefix needs to go (no rebuild of the whole window)
+        while timestamps and timestamps[0] <= window_start:
+            timestamps.popleft()
 
         # Check if exceeded
-        if len(rate_limit_storage[user_id]) >= RATE_LIMIT_REQUESTS:
+        if len(timestamps) >= RATE_LIMIT_REQUESTS:
             logger.warning(
                 f"⚠️ Rate limit exceeded for user {user_id}: "
-                f"{len(rate_limit_storage[user_id])} requests in {RATE_LIMIT_WINDOW}s"
+                f"{len(timestamps)} requests in {RATE_LIMIT_WINDOW}s"
             )
             return False
 
         # Add current request
-        rate_limit_storage[user_id].append(now)
+        timestamps.append(now)
         return True
 
 
@@ -409,18 +532,20 @@ async def send_heartbeat():
     if not AI_ORG_ID:
         return
 
-    while True:
-        try:
-            await asyncio.sleep(30)
+    # Build payload based on scope
+    payload = {
+        "org_id": AI_ORG_ID,
+    }
+    if AI_PROJECT_ID:
+        payload["project_id"] = AI_PROJECT_ID
 
-            # Build payload based on scope
-            payload = {
-                "org_id": AI_ORG_ID,
-            }
-            if AI_PROJECT_ID:
-                payload["project_id"] = AI_PROJECT_ID
+    # One client for the lifetime of the loop so heartbeats reuse the
+    # keep-alive connection instead of reconnecting every 30 seconds
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                await asyncio.sleep(30)
 
-            async with httpx.AsyncClient() as client:
                 response = await client.post(
                     f"{CONTROL_PLANE_URL}/internal/agents/heartbeat",
                     json=payload,
@@ -428,22 +553,22 @@ async def send_heartbeat():
                 )
                 response.raise_for_status()
                 logger.debug("💓 Heartbeat sent to Control Plane")
-        except asyncio.CancelledError:
-            logger.info("🛑 Heartbeat task cancelled")
-            break
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                # CP restarted and lost registry - re-register
-                logger.warning("⚠️  Agent not registered in CP (404), attempting re-registration...")
-                try:
-                    await register_with_control_plane()
-                    logger.info("✅ Re-registered with Control Plane after restart")
-                except Exception as re_err:
-                    logger.error(f"❌ Re-registration failed: {re_err}")
-            else:
+            except asyncio.CancelledError:
+                logger.info("🛑 Heartbeat task cancelled")
+                break
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:
+                    # CP restarted and lost registry - re-register
+                    logger.warning("⚠️  Agent not registered in CP (404), attempting re-registration...")
+                    try:
+                        await register_with_control_plane()
+                        logger.info("✅ Re-registered with Control Plane after restart")
+                    except Exception as re_err:
+                        logger.error(f"❌ Re-registration failed: {re_err}")
+                else:
+                    logger.warning(f"⚠️  Heartbeat failed: {e}")
+            except Exception as e:
                 logger.warning(f"⚠️  Heartbeat failed: {e}")
-        except Exception as e:
-            logger.warning(f"⚠️  Heartbeat failed: {e}")
 
 
 async def unregister_from_control_plane():
@@ -492,17 +617,16 @@ async def lifespan(app: FastAPI):
     init_authz_client(go_api_url)
     logger.info(f"AuthzClient initialized -> {go_api_url}")
 
-    # Initialize audit service
-    await init_audit_service()
+    # Audit, cost tracking and Control Plane registration are independent,
+    # so start them together; a registration failure still aborts startup.
+    await asyncio.gather(
+        init_audit_service(),
+        init_cost_tracking_service(),
+        register_with_control_plane(),
+    )
     logger.info("📝 Audit service initialized")
-
-    # Initialize cost tracking service
-    await init_cost_tracking_service()
     logger.info("💰 Cost tracking service initialized")
 
-    # Register with Control Plane (agent self-registration)
-    await register_with_control_plane()
-
     # Start CP heartbeat task (if registered)
     if AI_ORG_ID:
         cp_heartbeat_task = asyncio.create_task(send_heartbeat())
@@ -555,35 +679,53 @@ async def lifespan(app: FastAPI):
             pass
         logger.info("✅ CP Heartbeat task stopped")
 
-    # Unregister from Control Plane
-    await unregister_from_control_plane()
-
-    # Stop Slack Worker
-    if slack_worker_thread and slack_worker_thread.is_alive():
-        logger.info("🛑 Stopping Slack Worker...")
-        slack_stop_event.set()
-        slack_worker_thread.join(timeout=5.0)
-        logger.info("✅ Slack Worker stopped")
+    # The remaining steps are independent, so run them concurrently:
+    # shutdown takes as long as the slowest step instead of their sum
 
-    # Stop PGMQ consumer
-    await stop_pgmq_consumer()
-    logger.info("🤖 Incident analytics PGMQ consumer stopped")
+    async def stop_slack_worker():
+        if slack_worker_thread and slack_worker_thread.is_alive():
+            logger.info("🛑 Stopping Slack Worker...")
+            slack_stop_event.set()
+            # join() blocks - wait in a thread so the other steps keep running
+            await asyncio.to_thread(slack_worker_thread.join, 5.0)
+            logger.info("✅ Slack Worker stopped")
 
-    # Close AuthzClient HTTP connections
-    try:
-        authz_client = get_authz_client()
-        await authz_client.close()
-        logger.info("AuthzClient closed")
-    except RuntimeError:
-        pass  # Not initialized
-
-    # Shutdown audit service (flush remaining events)
-    await shutdown_audit_service()
-    logger.info("📝 Audit service stopped")
+    async def stop_pgmq():
+        await stop_pgmq_consumer()
+        logger.info("🤖 Incident analytics PGMQ consumer stopped")
 
-    # Shutdown cost tracking service (flush remaining events)
-    await shutdown_cost_tracking_service()
-    logger.info("💰 Cost tracking service stopped")
+    async def close_authz_client():
+        # Close AuthzClient HTTP connections
+        try:
+            authz_client = get_authz_client()
+            await authz_client.close()
+            logger.info("AuthzClient closed")
+        except RuntimeError:
+            pass  # Not initialized
+
+    async def stop_audit():
+        # Flush remaining audit events
+        await shutdown_audit_service()
+        logger.info("📝 Audit service stopped")
+
+    async def stop_cost_tracking():
+        # Flush remaining cost events
+        await shutdown_cost_tracking_service()
+        logger.info("💰 Cost tracking service stopped")
+
+    results = await asyncio.gather(
+        unregister_from_control_plane(),
+        stop_slack_worker(),
+        stop_pgmq(),
+        close_authz_client(),
+        stop_audit(),
+        stop_cost_tracking(),
+        drain_background_writes(),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"❌ Shutdown step failed: {result}")
 
     logger.info("✅ Application stopped")
 
@@ -678,12 +820,46 @@ logger.info("[Cost] Cost tracking routes loaded from routes_cost.py")
 # Import policy engine
 from policy_evaluator import PolicyEvaluator
 
-# In-memory cache for user MCP configs
+# In-memory cache for user MCP configs: user_id -> (loaded_at, servers)
 # Simple dict cache - cleared on restart
-user_mcp_cache: Dict[str, Dict[str, Any]] = {}
+user_mcp_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# Invalidation on create/delete/sync only reaches the replica that served the
+# request; entries expire so other replicas pick up changes within this window
+USER_MCP_CACHE_TTL = float(os.getenv("USER_MCP_CACHE_TTL", "60"))
 
-# Share cache with sync routes
+# Share cache with sync and MCP management routes
 set_mcp_cache(user_mcp_cache)
+set_mcp_routes_cache(user_mcp_cache)
+
+
+async def get_cached_user_mcp_servers(auth_token: str = "", user_id: str = "") -> Dict[str, Any]:
+    """Get user MCP servers, serving repeat sessions from user_mcp_cache.
+
+    Entries expire after USER_MCP_CACHE_TTL, are refreshed by
+    /api/sync-mcp-config and dropped whenever /api/mcp-servers creates or
+    deletes a server. Failed lookups are never cached.
+    """
+    if not user_id:
+        return await get_user_mcp_servers(auth_token=auth_token)
+
+    cached = user_mcp_cache.get(user_id)
+    if cached is not None:
+        loaded_at, servers = cached
+        if time.monotonic() - loaded_at < USER_MCP_CACHE_TTL:
+            return servers
+
+    try:
+        user_mcp_servers = await get_user_mcp_servers(
+            auth_token=auth_token, user_id=user_id, raise_on_error=True
+        )
+    except Exception:
+        # Already logged; serve this session without user servers but retry next time
+        user_mcp_cache.pop(user_id, None)
+        return {}
+
+    user_mcp_cache[user_id] = (time.monotonic(), user_mcp_servers)
+    return user_mcp_servers
 
 # Per-user locks for plugin installation (prevents race conditions)
 # Key: user_id, Value: asyncio.Lock
@@ -703,7 +879,7 @@ async def heartbeat_task(websocket: WebSocket, output_queue: asyncio.Queue = Non
 
             # Check if connection is still open before sending
             if websocket.client_state != WebSocketState.CONNECTED:
-                print("[!] Heartbeat task stopping: WebSocket not connected")
+                logger.debug("💓 Heartbeat task stopping: WebSocket not connected")
                 break
 
             try:
@@ -717,17 +893,75 @@ async def heartbeat_task(websocket: WebSocket, output_queue: asyncio.Queue = Non
             except Exception as e:
                 # Only log if it's not a normal disconnect
                 if "disconnect" not in str(e).lower() and "closed" not in str(e).lower():
-                    print(f"[!] Heartbeat failed: {e}")
+                    logger.warning(f"⚠️  Heartbeat failed: {e}")
                 break
     except asyncio.CancelledError:
         raise
 
 
+class PendingPermissions:
+    """
+    Per-connection registry of permission requests awaiting a user decision.
+
+    Each request_id gets its own future, so concurrent tool calls are resolved
+    independently as soon as their response arrives instead of every callback
+    polling (and re-queueing) a shared response queue.
+    """
+
+    def __init__(self):
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._closed = False
+
+    def register(self, request_id: str) -> asyncio.Future:
+        """Create the future for a request. Register BEFORE sending the request."""
+        future = asyncio.get_running_loop().create_future()
+        if self._closed:
+            future.set_result(None)
+        else:
+            self._futures[request_id] = future
+        return future
+
+    def discard(self, request_id: str):
+        """Forget a request (after it was answered or its callback was cancelled)."""
+        self._futures.pop(request_id, None)
+
+    def resolve(self, response: dict, match_unaddressed: bool = True) -> bool:
+        """
+        Deliver a permission response to the callback waiting for it.
+
+        Responses without a request_id go to the oldest pending request
+        (legacy clients) unless match_unaddressed is False.
+        """
+        request_id = response.get("request_id")
+        if request_id:
+            future = self._futures.pop(request_id, None)
+        elif match_unaddressed and self._futures:
+            future = self._futures.pop(next(iter(self._futures)))
+        else:
+            future = None
+
+        if future is None or future.done():
+            logger.warning(f"⚠️ Permission response for unknown request_id: {request_id}")
+            return False
+
+        future.set_result(response)
+        return True
+
+    def close(self):
+        """Connection closed: release every waiting callback with None."""
+        self._closed = True
+        for future in self._futures.values():
+            if not future.done():
+                future.set_result(None)
+        self._futures.clear()
+
+
 async def message_router(
     websocket: WebSocket,
     agent_queue: asyncio.Queue,
-    interrupt_queue: asyncio.Queue,
-    permission_response_queue: asyncio.Queue,
+    pending_permissions: PendingPermissions,
+    stop_events: Dict[str, asyncio.Event],
+    output_queue: asyncio.Queue,
 ):
     """
     Route incoming WebSocket messages to appropriate queues.
@@ -748,14 +982,12 @@ async def message_router(
             msg_type = data.get("type")
 
             if msg_type == "interrupt":
-                logger.info("[!] Routing interrupt message to interrupt_queue")
-                await interrupt_queue.put(data)
+                logger.info("[!] Handling interrupt message")
+                await handle_interrupt(data, stop_events, output_queue)
             elif msg_type == "permission_response" or data.get("allow") is not None:
                 # Permission approval/denial from user
-                logger.info(
-                    "[!] Routing permission response to permission_response_queue"
-                )
-                await permission_response_queue.put(data)
+                logger.info("[!] Routing permission response to pending request")
+                pending_permissions.resolve(data)
             elif msg_type == "fetch_capabilities":
                 # Special request to fetch available commands (sends "/" to SDK)
                 # This is a silent request - won't show in chat, just returns capabilities
@@ -775,8 +1007,7 @@ async def message_router(
     finally:
         # Signal end of messages to all queues
         await agent_queue.put(None)
-        await interrupt_queue.put(None)
-        await permission_response_queue.put(None)
+        pending_permissions.close()
         logger.info("📭 Router signaled end of messages")
 
 
@@ -815,52 +1046,35 @@ async def websocket_sender(websocket: WebSocket, output_queue: asyncio.Queue):
         logger.info("🧹 WebSocket sender finished")
 
 
-async def interrupt_task(
-    interrupt_queue: asyncio.Queue,
+async def handle_interrupt(
+    data: dict,
     stop_events: Dict[str, asyncio.Event],
     output_queue: asyncio.Queue,
 ):
-    """Handle interrupt requests from the interrupt queue.
+    """Handle an interrupt request straight from the message router.
 
     Sends acknowledgment through output_queue to avoid concurrent WebSocket writes.
     """
-    try:
-        while True:
-            data = await interrupt_queue.get()
-
-            # Check for end of messages
-            if data is None:
-                logger.info("[!] Interrupt task: End of messages")
-                break
+    if data.get("type") != "interrupt":
+        return
 
-            # Handle interrupt request
-            if data.get("type") == "interrupt":
-                session_id = data.get("session_id")
-                if session_id:
-                    logger.info(
-                        f"[!] Interrupt task: Setting stop event for session: {session_id}"
-                    )
+    session_id = data.get("session_id")
+    if not session_id:
+        return
 
-                    # Ensure event exists
-                    if session_id not in stop_events:
-                        stop_events[session_id] = asyncio.Event()
+    logger.info(f"[!] Interrupt: Setting stop event for session: {session_id}")
 
-                    # Set the event
-                    stop_events[session_id].set()
+    # Ensure event exists
+    if session_id not in stop_events:
+        stop_events[session_id] = asyncio.Event()
 
-                    # Send through queue to avoid concurrent WebSocket writes
-                    await output_queue.put(
-                        {"type": "interrupt_acknowledged", "session_id": session_id}
-                    )
+    # Set the event
+    stop_events[session_id].set()
 
-    except asyncio.CancelledError:
-        logger.info("[!] Interrupt task: Cancelled")
-        raise
-    except Exception as e:
-        logger.error(f"[!] Interrupt task error: {e}", exc_info=True)
-        raise  # Propagate error
-    finally:
-        logger.info("🧹 Interrupt task finished")
+    # Send through queue to avoid concurrent WebSocket writes
+    await output_queue.put(
+        {"type": "interrupt_acknowledged", "session_id": session_id}
+    )
 
 
 async def agent_task_streaming(
@@ -923,13 +1137,10 @@ async def agent_task_streaming(
 
         while True:
             try:
-                # Wait for message from queue (with timeout to check interrupts)
-                try:
-                    data = await asyncio.wait_for(agent_queue.get(), timeout=0.5)
-                except asyncio.TimeoutError:
-                    # Don't exit on interrupt - just skip and wait for next message
-                    # This allows new messages to be processed after an interrupt
-                    continue
+                # Block on the queue directly. Interrupts are handled by
+                # interrupt_monitor and never end the generator, so a timeout
+                # here only spun up a fresh wait_for task + timer every 0.5s.
+                data = await agent_queue.get()
 
                 # End of messages (WebSocket closed)
                 if data is None:
@@ -1106,6 +1317,8 @@ async def agent_task_streaming(
                                     "content": block.thinking
                                 })
                             elif isinstance(block, TextBlock):
+                                if not block.text:
+                                    continue  # Nothing to stream or persist
                                 await output_queue.put({
                                     "type": "text",
                                     "content": block.text
@@ -1169,7 +1382,7 @@ async def agent_task_streaming(
 
                                     # Save user message
                                     if not user_message_saved and current_prompt:
-                                        await save_message(
+                                        await save_message_in_order(
                                             conversation_id=claude_session_id,
                                             role="user",
                                             content=current_prompt,
@@ -1213,9 +1426,7 @@ async def agent_task_streaming(
                             try:
                                 cost_service = get_cost_service()
 
-                                # Use session_id as message_id since Python SDK doesn't provide message.id
-                                message_id = f"{message.session_id}_{step_counter}"
-
+                                # message_id (session_id + step) is derived by the cost service
                                 await cost_service.log_cost_from_assistant_message(
                                     message=message,  # Pass ResultMessage (has usage)
                                     user_id=context["user_id"],
@@ -1231,19 +1442,20 @@ async def agent_task_streaming(
                             except Exception as e:
                                 logger.error(f"Failed to log cost: {e}", exc_info=True)
 
-                        # Save assistant message when result received
-                        if context["conversation_id"] and assistant_text_buffer:
-                            await save_message(
+                        # Send complete signal to frontend (one turn done)
+                        await output_queue.put({"type": "complete"})
+                        logger.info("✅ Turn complete, waiting for next message...")
+
+                        # Save assistant message off the response path (skip tool-only turns)
+                        assistant_content = "".join(assistant_text_buffer)
+                        if context["conversation_id"] and assistant_content.strip():
+                            save_message_in_background(
                                 conversation_id=context["conversation_id"],
                                 role="assistant",
-                                content="".join(assistant_text_buffer),
+                                content=assistant_content,
                                 message_type="text"
                             )
 
-                        # Send complete signal to frontend (one turn done)
-                        await output_queue.put({"type": "complete"})
-                        logger.info("✅ Turn complete, waiting for next message...")
-
                         # Reset buffers for next turn
                         assistant_text_buffer = []
                         user_message_saved = False
@@ -1351,36 +1563,40 @@ async def agent_task_streaming(
             "memory_tools": memory_tools_server,
         }
 
-        user_mcp_servers = await get_user_mcp_servers(
-            auth_token=context["auth_token"],
-            user_id=context["user_id"]
-        )
-        if user_mcp_servers:
-            mcp_servers.update(user_mcp_servers)
-
-        # Load plugins
+        # User MCP servers, plugins, allowed tools and exported credentials are
+        # independent lookups (Postgres + Vault) - fetch them concurrently
         user_plugins = []
+        user_allowed = []
+        agent_env = {}
         if context["user_id"]:
-            user_plugins = load_user_plugins(context["user_id"])
+            # Each lookup has its own budget so one hung backend (e.g. Vault)
+            # cannot stall the session
+            user_mcp_servers, user_plugins, user_allowed, agent_env = await asyncio.gather(
+                with_lookup_budget(get_cached_user_mcp_servers(
+                    auth_token=context["auth_token"],
+                    user_id=context["user_id"]
+                ), {}, "User MCP servers"),
+                with_lookup_budget(asyncio.to_thread(load_user_plugins, context["user_id"]), [], "User plugins"),
+                with_lookup_budget(get_user_allowed_tools(context["user_id"]), [], "Allowed tools"),
+                with_lookup_budget(
+                    load_exported_credentials(context["user_id"], project_id=context.get("project_id")),
+                    {}, "Credential export"
+                ),
+            )
             logger.info(f"📦 Loaded {len(user_plugins)} plugins: {user_plugins}")
+        else:
+            user_mcp_servers = await get_user_mcp_servers(auth_token=context["auth_token"])
+
+        merge_user_mcp_servers(mcp_servers, user_mcp_servers)
 
         # Load allowed tools
-        allowed_tools = [
-            "mcp__incident_tools__get_incidents_by_time",
-            "mcp__incident_tools__get_incidents_by_id",
-            "mcp__incident_tools__get_current_time",
-            "mcp__incident_tools__get_incident_stats",
-            "mcp__memory_tools__update_memory",
-            "Skill"
-        ]
-        if context["user_id"]:
-            user_allowed = await get_user_allowed_tools(context["user_id"])
-            if user_allowed:
-                allowed_tools.extend(user_allowed)
+        # Ordered single-pass dedupe: user grants often repeat built-ins
+        allowed_tools = list(dict.fromkeys((*STREAMING_ALLOWED_TOOLS, *user_allowed)))
 
         # POLICY ENGINE: Filter allowed_tools — tools in this list bypass permission_callback entirely.
         # Remove tools covered by a DENY policy so the callback is still invoked for them.
-        if policy_evaluator:
+        # Skipped entirely when no DENY policy applies to this user.
+        if policy_evaluator and policy_evaluator.has_deny_policies():
             try:
                 filtered_allowed = []
                 for tool in allowed_tools:
@@ -1415,11 +1631,6 @@ async def agent_task_streaming(
         # Create SDK options - use resume if continuing conversation
         resume_id = context["conversation_id"] if context["conversation_id"] else None
 
-        # Load exported credentials from Vault into env
-        agent_env = {}
-        if context["user_id"]:
-            agent_env = await load_exported_credentials(context["user_id"], project_id=context.get("project_id"))
-        
         system_prompt = config.ai_agent_system_prompt
 
         options = ClaudeAgentOptions(
@@ -1437,7 +1648,13 @@ async def agent_task_streaming(
             system_prompt=system_prompt,
         )
 
-        print(f"🚀 Agent options: {options}")
+        # Summary only, at DEBUG: env carries exported credentials
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"🚀 Agent options: model={options.model}, resume={options.resume}, "
+                f"mcp_servers={list(mcp_servers)}, plugins={len(user_plugins)}, "
+                f"allowed_tools={len(allowed_tools)}"
+            )
 
         # Create message generator that includes first message
         async def full_message_generator():
@@ -1686,38 +1903,45 @@ async def agent_task(
             # Get user MCP servers
             # Secure flow: user_id from Zero-Trust session (no auth_token needed)
             # Unsecure flow: auth_token for JWT extraction
-            user_mcp_servers = await get_user_mcp_servers(
-                auth_token=current_auth_token or "",
-                user_id=user_id or ""
-            )
+            # Plugins, allowed tools and exported credentials are independent
+            # of it (Postgres + Vault), so fetch them concurrently
+            user_plugins = []
+            user_allowed = []
+            agent_env = {}
+            if user_id:
+                user_mcp_servers, user_plugins, user_allowed, agent_env = await asyncio.gather(
+                    with_lookup_budget(get_cached_user_mcp_servers(
+                        auth_token=current_auth_token or "",
+                        user_id=user_id
+                    ), {}, "User MCP servers"),
+                    with_lookup_budget(asyncio.to_thread(load_user_plugins, user_id), [], "User plugins"),
+                    with_lookup_budget(get_user_allowed_tools(user_id), [], "Allowed tools"),
+                    with_lookup_budget(
+                        load_exported_credentials(user_id, project_id=current_project_id),
+                        {}, "Credential export"
+                    ),
+                )
+            else:
+                user_mcp_servers = await get_cached_user_mcp_servers(
+                    auth_token=current_auth_token or "",
+                    user_id=""
+                )
 
-            if user_mcp_servers:
-                mcp_servers.update(user_mcp_servers)
+            merge_user_mcp_servers(mcp_servers, user_mcp_servers)
 
             logger.info(f"📁 User MCP servers: {mcp_servers}")
 
-            # Load user plugins from installed_plugins.json
-            user_plugins = []
             if user_id:
-                user_plugins = load_user_plugins(user_id)
                 if user_plugins:
                     logger.info(f"📦 Loaded {len(user_plugins)} user plugins")
                 else:
                     logger.debug(f"ℹ️  No plugins installed for user {user_id}")
 
             # Load allowed tools
-            allowed_tools = [
-                "mcp__incident_tools__get_incidents_by_time",
-                "mcp__incident_tools__get_incidents_by_id",
-                "mcp__incident_tools__get_incidents_by_id",
-                "mcp__incident_tools__get_current_time",
-                "mcp__incident_tools__get_incident_stats",
-                "mcp__memory_tools__update_memory"
-            ]
+            allowed_tools = list(BUILTIN_ALLOWED_TOOLS)
             if user_id:
-                user_allowed = await get_user_allowed_tools(user_id)
                 if user_allowed:
-                    allowed_tools.extend(user_allowed)
+                    allowed_tools = list(dict.fromkeys((*allowed_tools, *user_allowed)))
                     logger.info(f"✅ Loaded {len(user_allowed)} allowed tools from DB")
 
             # Use conversation_id for Claude resume (NOT session_id!)
@@ -1741,11 +1965,6 @@ async def agent_task(
                 project_id=current_project_id,
             ) if current_user_id else hooks_config
 
-            # Load exported credentials from Vault into env
-            agent_env = {}
-            if user_id:
-                agent_env = await load_exported_credentials(user_id, project_id=current_project_id)
-            
             system_prompt = config.ai_agent_system_prompt
 
             options = ClaudeAgentOptions(
@@ -1830,6 +2049,8 @@ async def agent_task(
                                         {"type": "thinking", "content": block.thinking}
                                     )
                                 elif isinstance(block, TextBlock):
+                                    if not block.text:
+                                        continue  # Nothing to stream or persist
                                     await output_queue.put(
                                         {"type": "text", "content": block.text}
                                     )
@@ -1915,7 +2136,7 @@ async def agent_task(
                                         # Use data["prompt"] to save current message, not just first
                                         user_prompt = data.get("prompt", "")
                                         if not user_message_saved and user_prompt:
-                                            await save_message(
+                                            await save_message_in_order(
                                                 conversation_id=claude_session_id,
                                                 role="user",
                                                 content=user_prompt,
@@ -1959,9 +2180,7 @@ async def agent_task(
                                 try:
                                     cost_service = get_cost_service()
 
-                                    # Use session_id as message_id
-                                    message_id = f"{message.session_id}_{alt_step_counter}"
-
+                                    # message_id (session_id + step) is derived by the cost service
                                     await cost_service.log_cost_from_assistant_message(
                                         message=message,
                                         user_id=current_user_id,
@@ -1977,16 +2196,16 @@ async def agent_task(
                                 except Exception as e:
                                     logger.error(f"Failed to log cost: {e}", exc_info=True)
 
-                            # Save assistant message to DB when response is complete
-                            if current_conversation_id and assistant_text_buffer:
-                                assistant_content = "".join(assistant_text_buffer)
-                                await save_message(
+                            # Save assistant message to DB without delaying the complete signal
+                            assistant_content = "".join(assistant_text_buffer)
+                            if current_conversation_id and assistant_content.strip():
+                                save_message_in_background(
                                     conversation_id=current_conversation_id,
                                     role="assistant",
                                     content=assistant_content,
                                     message_type="text"
                                 )
-                                logger.info(f"💾 Saved assistant message ({len(assistant_content)} chars) for conversation {current_conversation_id}")
+                                logger.info(f"💾 Saving assistant message ({len(assistant_content)} chars) for conversation {current_conversation_id}")
 
                     # Send complete signal to frontend (resets isSending state)
                     await output_queue.put({"type": "complete"})
@@ -2152,8 +2371,10 @@ async def verify_websocket_auth(websocket: WebSocket) -> tuple[bool, str]:
 
     try:
         # Get full user info (includes id, email, name)
+        # Runs in a worker thread: OIDC verification may fetch discovery/JWKS over
+        # blocking HTTP and must not stall every other session on the event loop.
         logger.info(f"🔍 Verifying token...")
-        user_info = get_user_info_from_token(token)
+        user_info = await asyncio.to_thread(get_user_info_from_token, token)
         logger.info(f"🔍 User info from token: {user_info}")
 
         if not user_info or not user_info.get("id"):
@@ -2167,7 +2388,7 @@ async def verify_websocket_auth(websocket: WebSocket) -> tuple[bool, str]:
         # Ensure user exists and get actual DB user_id (may differ from provider_id)
         # This matches Go API's ensureUserExistsByEmail behavior
         logger.info(f"🔍 Ensuring user exists: provider_id={provider_id} ({email}, {name})")
-        user_id = ensure_user_exists(provider_id, email=email, name=name)
+        user_id = await asyncio.to_thread(ensure_user_exists, provider_id, email=email, name=name)
         if user_id:
             logger.info(f"✅ User resolved: provider_id={provider_id} -> db_id={user_id} ({email})")
         else:
@@ -2274,8 +2495,7 @@ async def websocket_chat(websocket: WebSocket):
 
     # Create separate queues with size limits
     agent_queue = asyncio.Queue(maxsize=100)
-    interrupt_queue = asyncio.Queue(maxsize=10)
-    permission_response_queue = asyncio.Queue(maxsize=20)
+    pending_permissions = PendingPermissions()
 
     # Shared stop events dictionary (per session) - using asyncio.Event for thread safety
     stop_events: Dict[str, asyncio.Event] = {}
@@ -2292,7 +2512,7 @@ async def websocket_chat(websocket: WebSocket):
             Control tool permissions based on tool type and input.
 
             IMPORTANT: This callback does NOT read from WebSocket directly.
-            Instead, it sends request via output_queue and waits for response from permission_response_queue.
+            Instead, it sends request via output_queue and waits on its own future in pending_permissions.
             """
 
             # Log the tool request
@@ -2305,10 +2525,12 @@ async def websocket_chat(websocket: WebSocket):
             )
 
             logger.info(f"\n🔧 Tool Permission Request: {tool_name}")
-            logger.debug(f"   Input: {json.dumps(input_data, indent=2)}")
+            # Pretty-printing large tool inputs is costly - only do it when DEBUG is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"   Input: {json.dumps(input_data, indent=2)}")
 
             # Generate unique request ID
-            request_id = str(uuid.uuid4())
+            request_id = _new_request_id()
 
             # Audit log: tool requested
             await audit.log_tool_requested(
@@ -2346,6 +2568,9 @@ async def websocket_chat(websocket: WebSocket):
                         f"PolicyEvaluator.evaluate failed for {tool_name}: {_eval_err} — falling through to user prompt"
                     )
 
+            # Register before sending so a fast response cannot be missed
+            response_future = pending_permissions.register(request_id)
+
             # Send permission request with unique ID via output queue
             await output_queue.put(
                 {
@@ -2361,46 +2586,38 @@ async def websocket_chat(websocket: WebSocket):
                 f"   ❓ Waiting for user approval (request_id: {request_id})..."
             )
 
-            # Wait for response from queue (not directly from WebSocket!)
-            while True:
-                response = await permission_response_queue.get()
-
-                # Check for end signal
-                if response is None:
-                    logger.warning("Permission callback: End of messages")
-                    return PermissionResultDeny(message="Connection closed")
-
-                # Match request ID if present
-                if (
-                    response.get("request_id")
-                    and response.get("request_id") != request_id
-                ):
-                    # Not our response, put it back for other callbacks
-                    await permission_response_queue.put(response)
-                    await asyncio.sleep(0.01)  # Yield to event loop
-                    continue
+            # Wait for the router to resolve our request (not directly from WebSocket!)
+            try:
+                response = await response_future
+            finally:
+                pending_permissions.discard(request_id)
 
-                # Process response
-                if response.get("allow") in ("y", "yes"):
-                    logger.info("✅ Tool approved by user")
-                    # Audit log: tool approved
-                    await audit.log_tool_approved(
-                        user_id=authenticated_user_id,
-                        session_id=ws_session_id,
-                        tool_name=tool_name,
-                        request_id=request_id
-                    )
-                    return PermissionResultAllow()
-                else:
-                    logger.info("❌ Tool denied by user")
-                    # Audit log: tool denied
-                    await audit.log_tool_denied(
-                        user_id=authenticated_user_id,
-                        session_id=ws_session_id,
-                        tool_name=tool_name,
-                        request_id=request_id
-                    )
-                    return PermissionResultDeny(message="User denied permission")
+            # Check for end signal
+            if response is None:
+                logger.warning("Permission callback: End of messages")
+                return PermissionResultDeny(message="Connection closed")
+
+            # Process response
+            if response.get("allow") in ("y", "yes"):
+                logger.info("✅ Tool approved by user")
+                # Audit log: tool approved
+                await audit.log_tool_approved(
+                    user_id=authenticated_user_id,
+                    session_id=ws_session_id,
+                    tool_name=tool_name,
+                    request_id=request_id
+                )
+                return PermissionResultAllow()
+            else:
+                logger.info("❌ Tool denied by user")
+                # Audit log: tool denied
+                await audit.log_tool_denied(
+                    user_id=authenticated_user_id,
+                    session_id=ws_session_id,
+                    tool_name=tool_name,
+                    request_id=request_id
+                )
+                return PermissionResultDeny(message="User denied permission")
 
         # Start all tasks
         heartbeat = asyncio.create_task(
@@ -2409,7 +2626,7 @@ async def websocket_chat(websocket: WebSocket):
 
         router = asyncio.create_task(
             message_router(
-                websocket, agent_queue, interrupt_queue, permission_response_queue
+                websocket, agent_queue, pending_permissions, stop_events, output_queue
             ),
             name="router",
         )
@@ -2419,10 +2636,6 @@ async def websocket_chat(websocket: WebSocket):
             websocket_sender(websocket, output_queue), name="sender"
         )
 
-        interrupt = asyncio.create_task(
-            interrupt_task(interrupt_queue, stop_events, output_queue), name="interrupt"
-        )
-
         # Use streaming mode for continuous message handling
         agent = asyncio.create_task(
             agent_task_streaming(
@@ -2440,7 +2653,7 @@ async def websocket_chat(websocket: WebSocket):
         )
 
         # Wait for ALL tasks to complete
-        tasks = [heartbeat, router, sender, interrupt, agent]
+        tasks = [heartbeat, router, sender, agent]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # Check for errors
@@ -2472,7 +2685,7 @@ async def websocket_chat(websocket: WebSocket):
 
         # Get all running tasks and cancel them immediately
         all_tasks = [
-            t for t in [heartbeat, router, sender, interrupt, agent] if not t.done()
+            t for t in [heartbeat, router, sender, agent] if not t.done()
         ]
 
         for task in all_tasks:
@@ -2547,8 +2760,7 @@ async def websocket_secure_chat(websocket: WebSocket):
 
     # Create queues for message routing
     agent_queue = asyncio.Queue(maxsize=100)
-    interrupt_queue = asyncio.Queue(maxsize=10)
-    permission_response_queue = asyncio.Queue(maxsize=20)
+    pending_permissions = PendingPermissions()
     output_queue = asyncio.Queue(maxsize=100)
     stop_events: Dict[str, asyncio.Event] = {}
 
@@ -2556,7 +2768,6 @@ async def websocket_secure_chat(websocket: WebSocket):
     heartbeat = None
     router_task = None
     sender = None
-    interrupt = None
     agent = None
 
     try:
@@ -2706,9 +2917,10 @@ async def websocket_secure_chat(websocket: WebSocket):
                     msg_type = signed_message.get("payload", {}).get("type", "")
 
                     if msg_type == "interrupt":
-                        await interrupt_queue.put(data)
+                        await handle_interrupt(data, stop_events, output_queue)
                     elif msg_type == "permission_response" or data.get("allow") is not None:
-                        await permission_response_queue.put(data)
+                        # Signed responses must name the request they answer
+                        pending_permissions.resolve(data, match_unaddressed=False)
                     elif msg_type == "chat_message":
                         # Add session context to message
                         # NOTE: session_id here is for stop events tracking (Zero-Trust session)
@@ -2728,15 +2940,14 @@ async def websocket_secure_chat(websocket: WebSocket):
                 logger.error(f"❌ Secure message router error: {e}", exc_info=True)
             finally:
                 await agent_queue.put(None)
-                await interrupt_queue.put(None)
-                await permission_response_queue.put(None)
+                pending_permissions.close()
 
         # Define permission callback for secure chat
         async def secure_permission_callback(
             tool_name: str, input_data: dict, context: ToolPermissionContext
         ) -> PermissionResultAllow | PermissionResultDeny:
             """Permission callback that uses queues for secure communication."""
-            request_id = str(uuid.uuid4())
+            request_id = _new_request_id()
 
             # Audit log: tool requested
             await audit.log_tool_requested(
@@ -2747,6 +2958,8 @@ async def websocket_secure_chat(websocket: WebSocket):
                 request_id=request_id
             )
 
+            response_future = pending_permissions.register(request_id)
+
             await output_queue.put({
                 "type": "permission_request",
                 "request_id": request_id,
@@ -2755,34 +2968,32 @@ async def websocket_secure_chat(websocket: WebSocket):
                 "suggestions": context.suggestions,
             })
 
-            while True:
-                response = await permission_response_queue.get()
-                if response is None:
-                    return PermissionResultDeny(message="Connection closed")
-
-                if response.get("request_id") != request_id:
-                    await permission_response_queue.put(response)
-                    await asyncio.sleep(0.01)
-                    continue
-
-                if response.get("allow") in ("y", "yes", True):
-                    # Audit log: tool approved
-                    await audit.log_tool_approved(
-                        user_id=session.user_id,
-                        session_id=session_id,
-                        tool_name=tool_name,
-                        request_id=request_id
-                    )
-                    return PermissionResultAllow()
-                else:
-                    # Audit log: tool denied
-                    await audit.log_tool_denied(
-                        user_id=session.user_id,
-                        session_id=session_id,
-                        tool_name=tool_name,
-                        request_id=request_id
-                    )
-                    return PermissionResultDeny(message="User denied permission")
+            try:
+                response = await response_future
+            finally:
+                pending_permissions.discard(request_id)
+
+            if response is None:
+                return PermissionResultDeny(message="Connection closed")
+
+            if response.get("allow") in ("y", "yes", True):
+                # Audit log: tool approved
+                await audit.log_tool_approved(
+                    user_id=session.user_id,
+                    session_id=session_id,
+                    tool_name=tool_name,
+                    request_id=request_id
+                )
+                return PermissionResultAllow()
+            else:
+                # Audit log: tool denied
+                await audit.log_tool_denied(
+                    user_id=session.user_id,
+                    session_id=session_id,
+                    tool_name=tool_name,
+                    request_id=request_id
+                )
+                return PermissionResultDeny(message="User denied permission")
 
         # Start tasks
         heartbeat = asyncio.create_task(
@@ -2797,10 +3008,6 @@ async def websocket_secure_chat(websocket: WebSocket):
             websocket_sender(websocket, output_queue), name="secure_sender"
         )
 
-        interrupt = asyncio.create_task(
-            interrupt_task(interrupt_queue, stop_events, output_queue), name="secure_interrupt"
-        )
-
         # Use streaming mode for continuous message handling
         agent = asyncio.create_task(
             agent_task_streaming(
@@ -2816,7 +3023,7 @@ async def websocket_secure_chat(websocket: WebSocket):
             name="secure_agent",
         )
 
-        tasks = [heartbeat, router_task, sender, interrupt, agent]
+        tasks = [heartbeat, router_task, sender, agent]
         await asyncio.gather(*tasks, return_exceptions=True)
 
     except asyncio.TimeoutError:
@@ -2857,7 +3064,7 @@ async def websocket_secure_chat(websocket: WebSocket):
         except:
             pass
 
-        all_tasks = [t for t in [heartbeat, router_task, sender, interrupt, agent] if t and not t.done()]
+        all_tasks = [t for t in [heartbeat, router_task, sender, agent] if t and not t.done()]
         for task in all_tasks:
             task.cancel()
 
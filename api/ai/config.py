@@ -16,7 +16,7 @@ import logging
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
-import yaml
+from config_loader import load_yaml_file
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +29,13 @@ class AIAnalyticsConfig:
         self.enabled = self._get_bool("AI_ANALYTICS_ENABLED", config_dict.get("enabled", True))
         self.model = os.getenv("AI_ANALYTICS_MODEL") or config_dict.get("model", "sonnet")
         self.permission_mode = os.getenv("AI_ANALYTICS_PERMISSION_MODE") or config_dict.get("permission_mode", "default")
+        # Max concurrent Claude analyses per process (each spawns a CLI subprocess)
+        self.max_concurrency = int(os.getenv("AI_ANALYTICS_MAX_CONCURRENCY") or config_dict.get("max_concurrency", 2))
+        # Queue messages read per poll; defaults to one per concurrent analysis so
+        # a batch does not sit past its visibility timeout waiting for a slot
+        self.batch_size = int(
+            os.getenv("AI_ANALYTICS_BATCH_SIZE") or config_dict.get("batch_size") or self.max_concurrency
+        )
 
         # Setting sources
         setting_sources_str = os.getenv("AI_ANALYTICS_SETTING_SOURCES")
@@ -125,9 +132,8 @@ class Config:
         config_file = self._find_config_file()
         if config_file:
             try:
-                with open(config_file) as f:
-                    config_dict = yaml.safe_load(f) or {}
-                    logger.info(f"✅ Loaded config from: {config_file}")
+                config_dict = load_yaml_file(config_file) or {}
+                logger.info(f"✅ Loaded config from: {config_file}")
             except Exception as e:
                 logger.error(f"❌ Failed to load config from {config_file}: {e}")
 
@@ -5,6 +5,37 @@ from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed safe loader when PyYAML was built with it (several times
+# faster than the pure-Python SafeLoader), same safe tag set either way
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed YAML files keyed by (path, st_mtime_ns, st_size)
+_yaml_file_cache: Dict[tuple, Any] = {}
+
+
+def load_yaml_file(path) -> Any:
+    """
+    Parse a YAML file, reusing the previous parse while the file is unchanged.
+
+    The same config file is read by load_config, config.Config and the Slack
+    worker at startup; only the first read pays for parsing. Keying on mtime
+    and size means edits are picked up on the next call. The returned object
+    is shared, so callers must not mutate it.
+    """
+    path = str(path)
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    if key not in _yaml_file_cache:
+        # Bytes go straight to the parser, skipping a text-mode decode pass
+        with open(path, 'rb') as f:
+            parsed = yaml.load(f.read(), Loader=YAML_LOADER)
+        # Drop parses of older versions of this file
+        for stale in [k for k in _yaml_file_cache if k[0] == path]:
+            del _yaml_file_cache[stale]
+        _yaml_file_cache[key] = parsed
+    return _yaml_file_cache[key]
+
+
 def load_config():
     """
     Load configuration from YAML file specified by SLAR_CONFIG_PATH.
@@ -32,8 +63,7 @@ def load_config():
             return
 
     try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_yaml_file(config_path)
             
         if not config:
             logger.warning(f"⚠️  Config file {config_path} is empty")
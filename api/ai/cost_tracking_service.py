@@ -1,4 +1,5 @@
 import asyncio
+import json
 import logging
 import uuid
 from dataclasses import dataclass, field
@@ -6,12 +7,32 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Dict, List, Optional, Any
 
-from database_util import execute_query
+from database_util import execute_values_query
 
 logger = logging.getLogger(__name__)
 
+# Batch insert statement pieces, built once at import time
+_COST_INSERT_SQL = """
+    INSERT INTO ai_cost_logs (
+        event_id, created_at, user_id, org_id, project_id,
+        session_id, conversation_id, message_id, model, request_type,
+        step_number, input_tokens, output_tokens,
+        cache_creation_input_tokens, cache_read_input_tokens,
+        total_cost_usd, usage_metadata, metadata
+    ) VALUES
+"""
+# Use %s placeholders for psycopg2 (not $1, $2, etc.) - 18 columns
+_COST_ROW_PLACEHOLDER = "(" + ",".join(["%s"] * 18) + ")"
+_COST_ON_CONFLICT_SQL = " ON CONFLICT (event_id) DO NOTHING"
+_COST_BATCH_SQL = _COST_INSERT_SQL + "%s" + _COST_ON_CONFLICT_SQL
 
-@dataclass
+
+def _uuid_or_none(value):
+    """Convert empty strings to None for UUID fields."""
+    return None if value == '' or value is None else value
+
+
+@dataclass(slots=True)
 class CostEvent:
     """Cost tracking event for a single step (message with unique ID)"""
     user_id: str
@@ -22,7 +43,7 @@ class CostEvent:
     output_tokens: int
 
     # Auto-generated
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=lambda: uuid.uuid4().hex)  # UUID column accepts undashed hex
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
     # Optional context
@@ -220,6 +241,12 @@ class CostTrackingService:
                         timeout=self._flush_interval
                     )
                     self._buffer.append(event)
+                    # Drain already-queued events so they share one INSERT
+                    while len(self._buffer) < self._batch_size:
+                        try:
+                            self._buffer.append(self._queue.get_nowait())
+                        except asyncio.QueueEmpty:
+                            break
                 except asyncio.TimeoutError:
                     pass
 
@@ -238,29 +265,15 @@ class CostTrackingService:
             return
 
         try:
-            import json
-
-            # Helper to convert empty strings to None for UUID fields
-            def uuid_or_none(value):
-                return None if value == '' or value is None else value
-
-            # Build batch insert
-            values = []
-            params = []
-
-            for event in self._buffer:
-                # Use %s placeholders for psycopg2 (not $1, $2, etc.)
-                value_placeholders = ["%s"] * 18  # 18 columns
-                values.append(f"({','.join(value_placeholders)})")
-
-                params.extend([
+            rows = [
+                (
                     event.event_id,
                     event.created_at,
                     event.user_id,
-                    uuid_or_none(event.org_id),
-                    uuid_or_none(event.project_id),
-                    uuid_or_none(event.session_id),
-                    uuid_or_none(event.conversation_id),
+                    _uuid_or_none(event.org_id),
+                    _uuid_or_none(event.project_id),
+                    _uuid_or_none(event.session_id),
+                    _uuid_or_none(event.conversation_id),
                     event.message_id,  # SDK message ID for deduplication
                     event.model,
                     event.request_type,
@@ -272,20 +285,11 @@ class CostTrackingService:
                     float(event.total_cost_usd),
                     json.dumps(event.usage_metadata) if event.usage_metadata else None,
                     json.dumps(event.metadata) if event.metadata else None,
-                ])
-
-            query = f"""
-                INSERT INTO ai_cost_logs (
-                    event_id, created_at, user_id, org_id, project_id,
-                    session_id, conversation_id, message_id, model, request_type,
-                    step_number, input_tokens, output_tokens,
-                    cache_creation_input_tokens, cache_read_input_tokens,
-                    total_cost_usd, usage_metadata, metadata
-                ) VALUES {','.join(values)}
-                ON CONFLICT (event_id) DO NOTHING
-            """
-
-            execute_query(query, tuple(params), fetch=None)
+                )
+                for event in self._buffer
+            ]
+
+            execute_values_query(_COST_BATCH_SQL, rows, template=_COST_ROW_PLACEHOLDER)
 
             logger.info(f"💰 Flushed {len(self._buffer)} cost events to database")
             self._buffer.clear()
@@ -0,0 +1,52 @@
+"""
+CSV export helpers shared by the audit and cost routes.
+"""
+
+import csv
+import io
+import itertools
+from typing import Any, Callable, Dict, Iterator, List
+
+# Rows per chunk when streaming CSV exports
+CSV_CHUNK_ROWS = 1000
+
+
+def stream_csv(
+    rows: Iterator[Dict[str, Any]],
+    header: List[str],
+    to_row: Callable[[Dict[str, Any]], List[Any]],
+) -> Iterator[str]:
+    """
+    Build a chunked CSV body for a StreamingResponse.
+
+    The first row is pulled before returning, so a failing query (e.g. from
+    iter_query) raises in the route handler instead of after the response
+    has started.
+
+    Args:
+        rows: Row dicts, typically from database_util.iter_query
+        header: Column titles for the first CSV line
+        to_row: Maps one row dict to its CSV values
+
+    Returns:
+        Generator yielding the CSV text CSV_CHUNK_ROWS rows at a time
+    """
+    first = next(rows, None)
+    if first is not None:
+        rows = itertools.chain([first], rows)
+
+    def generate_csv():
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(header)
+
+        for i, row in enumerate(rows, 1):
+            writer.writerow(to_row(row))
+            if i % CSV_CHUNK_ROWS == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+
+        yield output.getvalue()
+
+    return generate_csv()
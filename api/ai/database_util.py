@@ -1,13 +1,34 @@
+import atexit
 import logging
+import os
+import threading
+import time
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 from contextlib import contextmanager
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Iterator, Tuple
 import functools
 from config import config
 
 logger = logging.getLogger(__name__)
 
+# Max pooled connections per process; extra concurrent callers get one-off connections
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+# Idle connections the pool keeps open (opened when the pool is created).
+# psycopg2 closes any returned connection once this many are idle, so a lower
+# value reconnects on most calls under concurrent load
+DB_POOL_MIN = min(int(os.getenv("DB_POOL_MIN", str(DB_POOL_MAX))), DB_POOL_MAX)
+
+# Pooled connections idle longer than this are pinged before being handed out,
+# so one killed by a server restart, failover or idle timeout is replaced
+DB_POOL_PING_AFTER = float(os.getenv("DB_POOL_PING_AFTER", "30"))
+
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+# id(conn) -> monotonic time it was last returned to the pool
+_last_used: Dict[int, float] = {}
+
 
 def resolve_user_id_from_token(auth_token: str) -> Optional[str]:
     """
@@ -35,30 +56,88 @@ def resolve_user_id_from_token(auth_token: str) -> Optional[str]:
         name=user_info.get("name") if user_info else None
     )
 
+def _get_pool() -> ThreadedConnectionPool:
+    """Create the process-wide connection pool on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if not config.database_url:
+                    raise ValueError("DATABASE_URL environment variable is not set")
+                _pool = ThreadedConnectionPool(
+                    minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX, dsn=config.database_url
+                )
+                atexit.register(_pool.closeall)
+    return _pool
+
+
+def _is_alive(conn) -> bool:
+    """Check a pooled connection with a cheap round-trip."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def _getconn(pool: ThreadedConnectionPool):
+    """
+    Borrow a connection, discarding any that died while idle in the pool.
+    Connections not seen before (newly opened) are pinged as well, since the
+    ones opened with the pool may have sat idle since startup.
+    """
+    # Each discard frees a slot, so the pool opens a fresh connection next
+    for _ in range(DB_POOL_MAX + 1):
+        conn = pool.getconn()
+        last_used = _last_used.pop(id(conn), None)
+        if not conn.closed and (
+            last_used is not None and time.monotonic() - last_used < DB_POOL_PING_AFTER
+            or _is_alive(conn)
+        ):
+            return conn
+        logger.warning("⚠️ Discarding dead pooled database connection")
+        pool.putconn(conn, close=True)
+    return pool.getconn()
+
+
 @contextmanager
 def get_db_connection():
     """
-    Context manager for database connection.
-    Yields a cursor that returns results as dictionaries.
-    Automatically handles commit/rollback and connection closing.
+    Context manager for a pooled database connection.
+    Commits on success and rolls back on error before the connection goes
+    back to the pool, so no transaction leaks into the next borrower.
+    Connections idle longer than DB_POOL_PING_AFTER are checked before use.
+    If the pool is exhausted, a one-off connection is opened and closed.
     """
-    conn = None
+    pool = _get_pool()
     try:
-        if not config.database_url:
-            raise ValueError("DATABASE_URL environment variable is not set")
-
+        conn = _getconn(pool)
+        pooled = True
+    except PoolError:
         conn = psycopg2.connect(config.database_url)
+        pooled = False
+
+    try:
         yield conn
+        conn.commit()
     except Exception as e:
         logger.error(f"❌ Database connection error: {e}")
-        if conn:
+        try:
             conn.rollback()
+        except psycopg2.Error:
+            pass  # Connection is broken; it is discarded below
         raise
     finally:
-        if conn:
+        if pooled:
+            if not conn.closed:
+                _last_used[id(conn)] = time.monotonic()
+            pool.putconn(conn, close=bool(conn.closed))
+        else:
             conn.close()
 
-def execute_query(query: str, params: tuple = None, fetch: str = "all"):
+def execute_query(query: str, params: tuple = None, fetch: str = "all", cursor_factory=RealDictCursor):
     """
     Execute a raw SQL query.
     
@@ -66,12 +145,14 @@ def execute_query(query: str, params: tuple = None, fetch: str = "all"):
         query: SQL query string
         params: Tuple of parameters for the query
         fetch: "all" for list of dicts, "one" for single dict, "none" for no return
+        cursor_factory: Row type (default: dicts). Pass None for plain tuples,
+            which skips the per-row dict for callers that read columns by position
         
     Returns:
-        List[Dict], Dict, or None
+        List[Dict], Dict, or None (tuples instead of dicts when cursor_factory=None)
     """
     with get_db_connection() as conn:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with conn.cursor(cursor_factory=cursor_factory) as cur:
             try:
                 cur.execute(query, params)
                 
@@ -88,6 +169,56 @@ def execute_query(query: str, params: tuple = None, fetch: str = "all"):
                 raise
 
 
+def iter_query(query: str, params: tuple = None, fetch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the rows of a SELECT through a server-side (named) cursor.
+
+    PostgreSQL sends rows fetch_size at a time, so memory is bounded by the
+    batch instead of the full result set. The pooled connection is held
+    until the generator is exhausted or closed.
+
+    Args:
+        query: SQL query string
+        params: Tuple of parameters for the query
+        fetch_size: Rows fetched per round-trip
+
+    Yields:
+        One dict per row
+    """
+    with get_db_connection() as conn:
+        with conn.cursor(name="streaming_cursor", cursor_factory=RealDictCursor) as cur:
+            cur.itersize = fetch_size
+            try:
+                cur.execute(query, params)
+            except Exception as e:
+                logger.error(f"❌ Query execution failed: {e}")
+                logger.debug(f"Query: {query}, Params: {params}")
+                raise
+            yield from cur
+
+
+def execute_values_query(query: str, rows: list, template: str = None, page_size: int = 500):
+    """
+    Execute a multi-row statement with psycopg2's execute_values.
+
+    Args:
+        query: SQL with a single "VALUES %s" placeholder
+        rows: Sequence of row tuples
+        template: Per-row template, e.g. "(%s, %s, %s)" (default: plain tuple)
+        page_size: Max rows per statement sent to the server
+    """
+    if not rows:
+        return
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            try:
+                execute_values(cur, query, rows, template=template, page_size=page_size)
+            except Exception as e:
+                logger.error(f"❌ Batch query execution failed: {e}")
+                logger.debug(f"Query: {query}, Rows: {len(rows)}")
+                raise
+
+
 @functools.lru_cache(maxsize=1000)
 def _get_cached_user_id(user_id: str) -> Optional[str]:
     """
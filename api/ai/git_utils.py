@@ -534,13 +534,18 @@ async def _inject_vault_credentials(
         generic_cred = get_credential(user_id, "generic_api_key", credential_name)
         if generic_cred and generic_cred.get("data"):
             raw_value = generic_cred["data"].get("value", "")
-            # Try parse as JSON for structured credentials
-            try:
-                parsed = _json.loads(raw_value)
-                if isinstance(parsed, dict):
-                    username = parsed.get("username", "")
-                    token = parsed.get("token") or parsed.get("password") or parsed.get("pat", "")
-            except (_json.JSONDecodeError, TypeError):
+            # Structured credentials are JSON objects - only those need a
+            # parse, so plain tokens skip a json.loads that would just raise
+            parsed = None
+            if raw_value.lstrip().startswith("{"):
+                try:
+                    parsed = _json.loads(raw_value)
+                except _json.JSONDecodeError:
+                    pass
+            if isinstance(parsed, dict):
+                username = parsed.get("username", "")
+                token = parsed.get("token") or parsed.get("password") or parsed.get("pat", "")
+            else:
                 # Plain text — treat as token (works for GitHub PAT with x-access-token)
                 token = raw_value.strip()
                 username = "x-access-token"
@@ -6,20 +6,71 @@ This runs in a background asyncio task within the main AI service.
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
-from typing import Dict, Any, Optional
-
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 
 from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient
 from config import config
+from database_util import execute_query
 from incident_tools import create_incident_tools_server, set_auth_token, set_org_id, set_project_id
 
 logger = logging.getLogger(__name__)
 
+# Instruction block shared by every incident analysis prompt
+ANALYSIS_INSTRUCTIONS = """You are SRE, analyze the incident below.
+
+# Analysis Format
+
+## 🔍 Summary
+[2-3 sentence executive summary]
+
+## 🔎 Probable Cause
+[1-2 sentences on likely root cause]
+
+## ⚡ Immediate Actions
+1. [First action]
+2. [Second action]
+
+## 🛠️ Investigation Steps
+1. [Where to look]
+2. [What metrics to check]
+3. [Commands to run]
+
+## 📝 Additional Context
+[Relevant patterns or context]
+
+Keep it practical and action-oriented for on-call engineers.
+"""
+
+# Identical alerts (re-fires, duplicates from several integrations) produce
+# identical prompts; reuse a recent analysis instead of re-running Claude.
+# Entries expire because the tools read live incident data. Analyses are
+# also shared across replicas through the incident_analysis_cache table.
+ANALYSIS_CACHE_SIZE = 128
+ANALYSIS_CACHE_TTL = 600.0  # seconds
+
+# Server-side long poll for an empty queue: wait up to QUEUE_POLL_SECONDS,
+# checking every QUEUE_POLL_INTERVAL_MS, before returning no messages
+QUEUE_POLL_SECONDS = 5
+QUEUE_POLL_INTERVAL_MS = 250
+
+# Process-wide bound on concurrent Claude analyses, created lazily so it
+# binds to the running event loop
+_analysis_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_analysis_semaphore() -> asyncio.Semaphore:
+    """Get the shared semaphore limiting concurrent Claude analyses."""
+    global _analysis_semaphore
+    if _analysis_semaphore is None:
+        _analysis_semaphore = asyncio.Semaphore(max(1, config.ai_analytics.max_concurrency))
+    return _analysis_semaphore
+
 
 class IncidentAnalyticsPGMQ:
     """Background PGMQ consumer for incident analytics"""
@@ -30,57 +81,50 @@ class IncidentAnalyticsPGMQ:
         self.queue_name = "incident_analysis_queue"
         self.running = False
 
+        # prompt hash -> (created_at, analysis), oldest first
+        self._analysis_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # prompt hash -> running analysis, shared by identical concurrent requests
+        self._inflight_analyses: Dict[str, "asyncio.Task[str]"] = {}
+        self._options: Optional[ClaudeAgentOptions] = None
+
         if not self.db_url:
             logger.warning("⚠️  DATABASE_URL not set - PGMQ incident analytics disabled")
             return
 
         logger.info(f"🤖 Incident Analytics PGMQ initialized (queue: {self.queue_name})")
 
-    def get_db_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(self.db_url, cursor_factory=RealDictCursor)
-
     def create_queue_if_not_exists(self):
         """Create PGMQ queue if it doesn't exist"""
         try:
-            conn = self.get_db_connection()
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT pgmq.create(%s);", (self.queue_name,))
-                conn.commit()
-            conn.close()
+            execute_query("SELECT pgmq.create(%s);", (self.queue_name,), fetch="none")
             logger.info(f"PGMQ queue '{self.queue_name}' ready")
         except Exception as e:
             logger.debug(f"Queue creation info: {e}")  # Likely already exists
 
-    def read_message(self, vt: int = 300) -> Optional[Dict]:
-        """Read a message from PGMQ queue (visibility timeout: 5 min)"""
-        try:
-            conn = self.get_db_connection()
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    "SELECT * FROM pgmq.read(%s, %s, %s);",
-                    (self.queue_name, vt, 1)
-                )
-                result = cursor.fetchone()
-            conn.close()
-            return dict(result) if result else None
-        except Exception as e:
-            logger.error(f"Error reading PGMQ message: {e}")
-            return None
+    def read_messages(self, vt: int = 300, qty: int = 1) -> List[Dict]:
+        """Read up to qty messages from PGMQ queue (visibility timeout: 5 min)
 
-    def delete_message(self, msg_id: int):
-        """Delete message after successful processing"""
+        Long-polls server-side for up to QUEUE_POLL_SECONDS when the queue is
+        empty, so an idle consumer issues one query per window instead of
+        sleeping between short polls. Errors propagate to run_consumer, which
+        backs off before polling again.
+        """
+        rows = execute_query(
+            "SELECT * FROM pgmq.read_with_poll(%s, %s, %s, %s, %s);",
+            (self.queue_name, vt, qty, QUEUE_POLL_SECONDS, QUEUE_POLL_INTERVAL_MS)
+        )
+        return [dict(row) for row in rows]
+
+    def delete_messages(self, msg_ids: List[int]):
+        """Delete successfully processed messages in one round trip"""
         try:
-            conn = self.get_db_connection()
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    "SELECT pgmq.delete(%s, %s);",
-                    (self.queue_name, msg_id)
-                )
-                conn.commit()
-            conn.close()
+            execute_query(
+                "SELECT pgmq.delete(%s, %s::bigint[]);",
+                (self.queue_name, msg_ids),
+                fetch="none"
+            )
         except Exception as e:
-            logger.error(f"Error deleting PGMQ message {msg_id}: {e}")
+            logger.error(f"Error deleting PGMQ messages {msg_ids}: {e}")
 
     def build_analysis_prompt(self, incident: Dict[str, Any]) -> str:
         """Build analysis prompt from incident data"""
@@ -92,7 +136,9 @@ class IncidentAnalyticsPGMQ:
         labels = incident.get("labels", {})
         raw_data = incident.get("raw_data", {})
 
-        prompt = f"""You are SRE, analyze this incident 
+        # Static instructions first, incident data last: every analysis then
+        # shares the same prompt prefix, which the model provider can cache
+        prompt = ANALYSIS_INSTRUCTIONS + f"""
 # Incident Details
 - **Title**: {title}
 - **Source**: {source}
@@ -111,30 +157,6 @@ class IncidentAnalyticsPGMQ:
         if raw_data:
             prompt += f"\n# Raw Data\n```json\n{json.dumps(raw_data, indent=2)}\n```\n"
 
-        prompt += """
-
-# Analysis Format
-
-## 🔍 Summary
-[2-3 sentence executive summary]
-
-## 🔎 Probable Cause
-[1-2 sentences on likely root cause]
-
-## ⚡ Immediate Actions
-1. [First action]
-2. [Second action]
-
-## 🛠️ Investigation Steps
-1. [Where to look]
-2. [What metrics to check]
-3. [Commands to run]
-
-## 📝 Additional Context
-[Relevant patterns or context]
-
-Keep it practical and action-oriented for on-call engineers.
-"""
         return prompt
 
     def get_analytics_config(self) -> Dict[str, Any]:
@@ -158,14 +180,128 @@ Keep it practical and action-oriented for on-call engineers.
             "allowed_tools": ai_config.allowed_tools,
         }
 
+    def get_analysis_options(self) -> ClaudeAgentOptions:
+        """Build the ClaudeAgentOptions shared by every incident analysis.
+
+        The analytics config is fixed at startup and the incident tools server
+        reads tenant context from ContextVars when a tool runs, so the options
+        are built once and reused for each one-off session.
+        """
+        if self._options is None:
+            analytics_config = self.get_analytics_config()
+            self._options = ClaudeAgentOptions(
+                permission_mode=analytics_config["permission_mode"],
+                model=analytics_config["model"],
+                setting_sources=analytics_config["setting_sources"],
+                allowed_tools=analytics_config["allowed_tools"],
+                mcp_servers={"incident_tools": create_incident_tools_server()},
+                max_turns=5
+            )
+        return self._options
+
+    def _analysis_cache_key(self, prompt: str, incident: Dict[str, Any], model: str) -> str:
+        """Hash everything that determines an analysis: model, tenant and prompt."""
+        org_id = incident.get("organization_id") or incident.get("org_id") or ""
+        project_id = incident.get("project_id") or ""
+        payload = "\x00".join((model or "", org_id, project_id, prompt))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _get_cached_analysis(self, key: str) -> Optional[str]:
+        """Return a fresh cached analysis for key, dropping it if expired."""
+        entry = self._analysis_cache.get(key)
+        if entry is None:
+            return None
+        created_at, analysis = entry
+        if time.monotonic() - created_at > ANALYSIS_CACHE_TTL:
+            del self._analysis_cache[key]
+            return None
+        self._analysis_cache.move_to_end(key)
+        return analysis
+
+    def _store_analysis(self, key: str, analysis: str, age: float = 0.0):
+        """Cache an analysis, evicting the least recently used entry when full."""
+        self._analysis_cache[key] = (time.monotonic() - age, analysis)
+        self._analysis_cache.move_to_end(key)
+        while len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+
+    def _load_shared_analysis(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return (analysis, age in seconds) from the shared cache table, if fresh."""
+        try:
+            row = execute_query(
+                """
+                SELECT analysis, EXTRACT(EPOCH FROM NOW() - created_at)::float AS age
+                FROM incident_analysis_cache
+                WHERE prompt_hash = %s AND created_at > NOW() - make_interval(secs => %s)
+                """,
+                (key, ANALYSIS_CACHE_TTL),
+                fetch="one"
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Shared analysis cache lookup failed: {e}")
+            return None
+        return (row["analysis"], row["age"]) if row else None
+
+    def _save_shared_analysis(self, key: str, analysis: str):
+        """Upsert an analysis into the shared cache table, pruning expired rows."""
+        try:
+            execute_query(
+                """
+                WITH pruned AS (
+                    DELETE FROM incident_analysis_cache
+                    WHERE created_at < NOW() - make_interval(secs => %s)
+                )
+                INSERT INTO incident_analysis_cache (prompt_hash, analysis)
+                VALUES (%s, %s)
+                ON CONFLICT (prompt_hash)
+                DO UPDATE SET analysis = EXCLUDED.analysis, created_at = NOW()
+                """,
+                (ANALYSIS_CACHE_TTL, key, analysis),
+                fetch="none"
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Shared analysis cache write failed: {e}")
+
     async def analyze_incident(self, incident: Dict[str, Any]) -> str:
         """Analyze incident using Claude Agent SDK"""
-        from claude_agent_sdk import query, ClaudeAgentOptions
-
         prompt = self.build_analysis_prompt(incident)
 
-        # Load configuration dynamically from environment
-        config = self.get_analytics_config()
+        options = self.get_analysis_options()
+
+        cache_key = self._analysis_cache_key(prompt, incident, options.model)
+        cached = self._get_cached_analysis(cache_key)
+        if cached is not None:
+            logger.info("♻️  Reusing cached analysis for identical incident prompt")
+            return cached
+
+        # Identical alerts often arrive together; join an analysis that is
+        # already running instead of starting a second Claude session
+        task = self._inflight_analyses.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._run_analysis(prompt, incident, options, cache_key))
+            self._inflight_analyses[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight_analyses.pop(cache_key, None))
+        else:
+            logger.info("⏳ Joining in-flight analysis for identical incident prompt")
+
+        # Shield so one cancelled waiter does not cancel the shared analysis
+        return await asyncio.shield(task)
+
+    async def _run_analysis(
+        self, prompt: str, incident: Dict[str, Any], options: ClaudeAgentOptions, cache_key: str
+    ) -> str:
+        """Run one Claude analysis session and cache a non-empty result.
+
+        Another replica (or this one before a restart) may already have
+        analyzed an identical incident, so the shared cache table is checked
+        before starting a session.
+        """
+        shared = await asyncio.to_thread(self._load_shared_analysis, cache_key)
+        if shared is not None:
+            analysis, age = shared
+            logger.info("♻️  Reusing shared cached analysis for identical incident prompt")
+            self._store_analysis(cache_key, analysis, age)
+            return analysis
 
         # Set tenant context from incident data (ReBAC tenant isolation)
         # Note: incident_tools now uses direct DB access, no API key needed
@@ -181,77 +317,57 @@ Keep it practical and action-oriented for on-call engineers.
             set_project_id(project_id)
             logger.info(f"📁 Project context set for incident analysis: {project_id}")
 
-        # Load MCP servers (AFTER auth context is set)
-        incident_tools_server = create_incident_tools_server()
-        mcp_servers = {"incident_tools": incident_tools_server}
-        
-        logger.info(f" INCIDENT TOOLS SERVER: {incident_tools_server}")
-
-        # Configure options for one-off analysis
-        options = ClaudeAgentOptions(
-            permission_mode=config["permission_mode"],
-            model=config["model"],
-            setting_sources=config["setting_sources"],
-            allowed_tools=config["allowed_tools"],
-            mcp_servers=mcp_servers,
-            max_turns=5
-        )
-
-        full_response = ""
+        # Collect text blocks and join once; repeated str += copies the
+        # growing analysis on every block
+        chunks: List[str] = []
 
         # Use query() for one-off analysis (creates new session each time)
-        async with ClaudeSDKClient(options=options) as client:
-            await client.query(prompt=prompt)
-            async for message in client.receive_response():
-                print(message)
-                if hasattr(message, 'content'):
-                    for block in message.content:
-                        if hasattr(block, 'text'):
-                            full_response += block.text
+        async with get_analysis_semaphore():
+            async with ClaudeSDKClient(options=options) as client:
+                await client.query(prompt=prompt)
+                async for message in client.receive_response():
+                    logger.debug("Analysis message: %s", message)
+                    if hasattr(message, 'content'):
+                        for block in message.content:
+                            if hasattr(block, 'text'):
+                                chunks.append(block.text)
+
+        full_response = "".join(chunks)
+        if full_response.strip():
+            self._store_analysis(cache_key, full_response)
+            await asyncio.to_thread(self._save_shared_analysis, cache_key, full_response)
 
         return full_response
 
     def update_incident_description(self, incident_id: str, analysis: str) -> bool:
         """Update incident with AI analysis"""
         try:
-            conn = self.get_db_connection()
-            with conn.cursor() as cursor:
-                # Get current description
-                cursor.execute(
-                    "SELECT description FROM incidents WHERE id = %s",
-                    (incident_id,)
-                )
-                result = cursor.fetchone()
-
-                if not result:
-                    logger.error(f"Incident {incident_id} not found")
-                    return False
-
-                current_desc = result['description'] or ""
-
-                # Prepend analysis
-                new_description = f"""# 🤖 AI Analysis
+            # Prepend analysis in one statement, so a concurrent edit between a
+            # read and the write cannot be overwritten
+            analysis_header = f"""# 🤖 AI Analysis
 
 {analysis}
 
 ---
 
 # Original Alert
-{current_desc}
 """
+            result = execute_query(
+                """
+                UPDATE incidents
+                SET description = %s || COALESCE(description, '') || E'\\n',
+                    updated_at = NOW()
+                WHERE id = %s
+                RETURNING id
+                """,
+                (analysis_header, incident_id),
+                fetch="one"
+            )
+
+            if not result:
+                logger.error(f"Incident {incident_id} not found")
+                return False
 
-                # Update
-                cursor.execute(
-                    """
-                    UPDATE incidents
-                    SET description = %s, updated_at = NOW()
-                    WHERE id = %s
-                    """,
-                    (new_description, incident_id)
-                )
-                conn.commit()
-
-            conn.close()
             logger.info(f"Updated incident {incident_id} with AI analysis")
             return True
 
@@ -259,9 +375,12 @@ Keep it practical and action-oriented for on-call engineers.
             logger.error(f"Failed to update incident {incident_id}: {e}", exc_info=True)
             return False
 
-    async def process_message(self, message: Dict):
-        """Process one incident analysis request"""
-        msg_id = message.get('msg_id')
+    async def process_message(self, message: Dict) -> bool:
+        """Process one incident analysis request.
+
+        Returns True when the incident was updated and the message can be
+        deleted; failed messages reappear after their visibility timeout.
+        """
         message_data = message.get('message', {})
 
         incident_id = message_data.get('incident_id')
@@ -274,16 +393,16 @@ Keep it practical and action-oriented for on-call engineers.
             analysis = await self.analyze_incident(incident_data)
 
             # Update incident
-            if self.update_incident_description(incident_id, analysis):
-                # Success - delete message
-                self.delete_message(msg_id)
+            if await asyncio.to_thread(self.update_incident_description, incident_id, analysis):
                 logger.info(f"Completed analysis for incident {incident_id}")
-            else:
-                logger.error(f"Failed to update incident {incident_id}")
+                return True
+            logger.error(f"Failed to update incident {incident_id}")
 
         except Exception as e:
             logger.error(f"Error processing incident {incident_id}: {e}", exc_info=True)
 
+        return False
+
     async def run_consumer(self):
         """Main consumer loop - runs in background"""
         if not self.db_url:
@@ -291,20 +410,25 @@ Keep it practical and action-oriented for on-call engineers.
             return
 
         self.running = True
-        self.create_queue_if_not_exists()
+        await asyncio.to_thread(self.create_queue_if_not_exists)
 
         logger.info(f"🚀 Starting PGMQ incident analytics consumer...")
 
         while self.running:
             try:
-                # Read message
-                message = self.read_message(vt=300)  # 5 min timeout
-
-                if message:
-                    await self.process_message(message)
-                else:
-                    # No messages - sleep
-                    await asyncio.sleep(2)
+                # Read a batch of messages
+                messages = await asyncio.to_thread(
+                    self.read_messages, vt=300, qty=config.ai_analytics.batch_size  # 5 min timeout
+                )
+
+                if messages:
+                    # Claude sessions are bounded by the analysis semaphore
+                    results = await asyncio.gather(*(self.process_message(m) for m in messages))
+
+                    # Delete the whole batch's successes at once
+                    done = [m['msg_id'] for m, ok in zip(messages, results) if ok]
+                    if done:
+                        await asyncio.to_thread(self.delete_messages, done)
 
             except Exception as e:
                 logger.error(f"PGMQ consumer error: {e}", exc_info=True)
@@ -5,17 +5,17 @@ Tools for fetching and managing incidents directly from the database.
 This is an internal service - no API authentication required.
 """
 
+import asyncio
 import json
 import os
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Any, Optional
 from contextvars import ContextVar
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
 from claude_agent_sdk import create_sdk_mcp_server, tool
 
-from config import config
+from database_util import execute_query
 
 # Context variables for tenant isolation (ReBAC)
 _org_id_ctx: ContextVar[Optional[str]] = ContextVar("org_id", default=None)
@@ -53,12 +53,56 @@ def get_auth_token() -> str:
     return ""
 
 
-def _get_db_connection():
-    """Get database connection using centralized config."""
-    db_url = config.database_url
-    if not db_url:
-        raise Exception("DATABASE_URL not configured")
-    return psycopg2.connect(db_url, cursor_factory=RealDictCursor)
+def _json_default(value: Any) -> str:
+    """Serialize DB values json can't encode: datetimes as ISO 8601, others via str()."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+async def _fetch_incident_stats(where_sql: str, params: list) -> tuple:
+    """Run the incident stats queries concurrently, each on its own pooled connection.
+
+    This only saves a round-trip because the pool keeps DB_POOL_MIN idle
+    connections (see database_util); with a near-empty idle pool the second
+    query would pay a fresh connect instead.
+    """
+    # Counts by status and average timings (resolved incidents only),
+    # in a single scan over the matching incidents
+    counts_query = f"""
+        SELECT
+            COUNT(*) as total,
+            COUNT(*) FILTER (WHERE status = 'triggered') as triggered,
+            COUNT(*) FILTER (WHERE status = 'acknowledged') as acknowledged,
+            COUNT(*) FILTER (WHERE status = 'resolved') as resolved,
+            AVG(EXTRACT(EPOCH FROM (resolved_at - created_at)))
+                FILTER (WHERE resolved_at IS NOT NULL) as avg_resolution_seconds,
+            AVG(EXTRACT(EPOCH FROM (acknowledged_at - created_at)))
+                FILTER (WHERE resolved_at IS NOT NULL) as avg_ack_seconds
+        FROM incidents
+        WHERE {where_sql}
+    """
+
+    # Counts by severity
+    severity_query = f"""
+        SELECT severity, COUNT(*) as count
+        FROM incidents
+        WHERE {where_sql}
+        GROUP BY severity
+        ORDER BY
+            CASE severity
+                WHEN 'critical' THEN 1
+                WHEN 'error' THEN 2
+                WHEN 'warning' THEN 3
+                WHEN 'info' THEN 4
+                ELSE 5
+            END
+    """
+
+    return await asyncio.gather(
+        asyncio.to_thread(execute_query, counts_query, params, "one"),
+        asyncio.to_thread(execute_query, severity_query, params),
+    )
 
 
 async def _get_incidents_by_time_impl(args: dict[str, Any]) -> dict[str, Any]:
@@ -81,9 +125,10 @@ async def _get_incidents_by_time_impl(args: dict[str, Any]) -> dict[str, Any]:
 
     # Validate inputs
     try:
-        start_dt = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-        end_dt = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
-    except (ValueError, AttributeError) as e:
+        # Python 3.11+ fromisoformat accepts the "Z" suffix directly
+        start_dt = datetime.fromisoformat(start_time)
+        end_dt = datetime.fromisoformat(end_time)
+    except (ValueError, TypeError) as e:
         return {
             "content": [
                 {
@@ -108,61 +153,47 @@ async def _get_incidents_by_time_impl(args: dict[str, Any]) -> dict[str, Any]:
     project_id = args.get("project_id") or get_project_id()
 
     try:
-        conn = _get_db_connection()
-        with conn.cursor() as cursor:
-            # Build query with ReBAC filtering
-            query = """
-                SELECT
-                    i.id, i.title, i.description, i.status, i.severity, i.urgency,
-                    i.created_at, i.updated_at, i.acknowledged_at, i.resolved_at,
-                    i.assigned_to, i.service_id,
-                    u.name as assigned_to_name,
-                    s.name as service_name
-                FROM incidents i
-                LEFT JOIN users u ON i.assigned_to = u.id
-                LEFT JOIN services s ON i.service_id = s.id
-                WHERE i.created_at >= %s AND i.created_at <= %s
-            """
-            params = [start_dt, end_dt]
-
-            # Add status filter
-            if status != "all":
-                query += " AND i.status = %s"
-                params.append(status)
-
-            # Add ReBAC filters
-            if org_id:
-                query += " AND i.organization_id = %s"
-                params.append(org_id)
-            if project_id:
-                query += " AND i.project_id = %s"
-                params.append(project_id)
-
-            query += " ORDER BY i.created_at DESC LIMIT %s"
-            params.append(limit)
-
-            cursor.execute(query, params)
-            incidents = cursor.fetchall()
-
-        conn.close()
+        # Build query with ReBAC filtering
+        query = """
+            SELECT
+                i.id, i.title, i.description, i.status, i.severity, i.urgency,
+                i.created_at, i.updated_at, i.acknowledged_at, i.resolved_at,
+                i.assigned_to, i.service_id,
+                u.name as assigned_to_name,
+                s.name as service_name
+            FROM incidents i
+            LEFT JOIN users u ON i.assigned_to = u.id
+            LEFT JOIN services s ON i.service_id = s.id
+            WHERE i.created_at >= %s AND i.created_at <= %s
+        """
+        params = [start_dt, end_dt]
+
+        # Add status filter
+        if status != "all":
+            query += " AND i.status = %s"
+            params.append(status)
+
+        # Add ReBAC filters
+        if org_id:
+            query += " AND i.organization_id = %s"
+            params.append(org_id)
+        if project_id:
+            query += " AND i.project_id = %s"
+            params.append(project_id)
+
+        query += " ORDER BY i.created_at DESC LIMIT %s"
+        params.append(limit)
+
+        incidents = await asyncio.to_thread(execute_query, query, params)
 
         # Return raw data - LLM handles formatting
-        # Convert datetime objects to strings for JSON serialization
-        incidents_data = []
-        for inc in incidents:
-            inc_dict = dict(inc)
-            for key, value in inc_dict.items():
-                if hasattr(value, 'isoformat'):
-                    inc_dict[key] = value.isoformat()
-            incidents_data.append(inc_dict)
-        
         result = {
             "query": {"start_time": start_time, "end_time": end_time, "status": status},
-            "count": len(incidents_data),
-            "incidents": incidents_data
+            "count": len(incidents),
+            "incidents": incidents
         }
         
-        return {"content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}]}
+        return {"content": [{"type": "text", "text": json.dumps(result, indent=2, default=_json_default)}]}
 
     except Exception as e:
         return {
@@ -196,40 +227,35 @@ async def _get_incident_by_id_impl(args: dict[str, Any]) -> dict[str, Any]:
     project_id = args.get("project_id") or get_project_id()
 
     try:
-        conn = _get_db_connection()
-        with conn.cursor() as cursor:
-            query = """
-                SELECT
-                    i.id, i.title, i.description, i.status, i.severity, i.urgency,
-                    i.created_at, i.updated_at, i.acknowledged_at, i.resolved_at,
-                    i.assigned_to, i.acknowledged_by, i.resolved_by,
-                    i.service_id, i.incident_key, i.escalation_policy_id,
-                    i.organization_id, i.project_id,
-                    u1.name as assigned_to_name,
-                    u2.name as acknowledged_by_name,
-                    u3.name as resolved_by_name,
-                    s.name as service_name
-                FROM incidents i
-                LEFT JOIN users u1 ON i.assigned_to = u1.id
-                LEFT JOIN users u2 ON i.acknowledged_by = u2.id
-                LEFT JOIN users u3 ON i.resolved_by = u3.id
-                LEFT JOIN services s ON i.service_id = s.id
-                WHERE i.id = %s
-            """
-            params = [incident_id]
-
-            # Add ReBAC filters
-            if org_id:
-                query += " AND i.organization_id = %s"
-                params.append(org_id)
-            if project_id:
-                query += " AND i.project_id = %s"
-                params.append(project_id)
-
-            cursor.execute(query, params)
-            incident = cursor.fetchone()
-
-        conn.close()
+        query = """
+            SELECT
+                i.id, i.title, i.description, i.status, i.severity, i.urgency,
+                i.created_at, i.updated_at, i.acknowledged_at, i.resolved_at,
+                i.assigned_to, i.acknowledged_by, i.resolved_by,
+                i.service_id, i.incident_key, i.escalation_policy_id,
+                i.organization_id, i.project_id,
+                u1.name as assigned_to_name,
+                u2.name as acknowledged_by_name,
+                u3.name as resolved_by_name,
+                s.name as service_name
+            FROM incidents i
+            LEFT JOIN users u1 ON i.assigned_to = u1.id
+            LEFT JOIN users u2 ON i.acknowledged_by = u2.id
+            LEFT JOIN users u3 ON i.resolved_by = u3.id
+            LEFT JOIN services s ON i.service_id = s.id
+            WHERE i.id = %s
+        """
+        params = [incident_id]
+
+        # Add ReBAC filters
+        if org_id:
+            query += " AND i.organization_id = %s"
+            params.append(org_id)
+        if project_id:
+            query += " AND i.project_id = %s"
+            params.append(project_id)
+
+        incident = await asyncio.to_thread(execute_query, query, params, "one")
 
         if not incident:
             return {
@@ -240,12 +266,7 @@ async def _get_incident_by_id_impl(args: dict[str, Any]) -> dict[str, Any]:
             }
 
         # Return raw data - LLM handles formatting
-        inc_dict = dict(incident)
-        for key, value in inc_dict.items():
-            if hasattr(value, 'isoformat'):
-                inc_dict[key] = value.isoformat()
-        
-        return {"content": [{"type": "text", "text": json.dumps(inc_dict, indent=2, default=str)}]}
+        return {"content": [{"type": "text", "text": json.dumps(incident, indent=2, default=_json_default)}]}
 
     except Exception as e:
         return {
@@ -294,77 +315,38 @@ async def _get_incident_stats_impl(args: dict[str, Any]) -> dict[str, Any]:
     project_id = args.get("project_id") or get_project_id()
 
     try:
-        conn = _get_db_connection()
-        with conn.cursor() as cursor:
-            # Build base WHERE clause
-            where_clauses = []
-            params = []
-
-            if start_time:
-                where_clauses.append("created_at >= %s")
-                params.append(start_time)
-            if org_id:
-                where_clauses.append("organization_id = %s")
-                params.append(org_id)
-            if project_id:
-                where_clauses.append("project_id = %s")
-                params.append(project_id)
-
-            where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
-
-            # Get total counts by status
-            cursor.execute(f"""
-                SELECT
-                    COUNT(*) as total,
-                    COUNT(*) FILTER (WHERE status = 'triggered') as triggered,
-                    COUNT(*) FILTER (WHERE status = 'acknowledged') as acknowledged,
-                    COUNT(*) FILTER (WHERE status = 'resolved') as resolved
-                FROM incidents
-                WHERE {where_sql}
-            """, params)
-            counts = cursor.fetchone()
-
-            # Get counts by severity
-            cursor.execute(f"""
-                SELECT severity, COUNT(*) as count
-                FROM incidents
-                WHERE {where_sql}
-                GROUP BY severity
-                ORDER BY
-                    CASE severity
-                        WHEN 'critical' THEN 1
-                        WHEN 'error' THEN 2
-                        WHEN 'warning' THEN 3
-                        WHEN 'info' THEN 4
-                        ELSE 5
-                    END
-            """, params)
-            severity_counts = cursor.fetchall()
-
-            # Get average resolution time (for resolved incidents)
-            cursor.execute(f"""
-                SELECT
-                    AVG(EXTRACT(EPOCH FROM (resolved_at - created_at))) as avg_resolution_seconds,
-                    AVG(EXTRACT(EPOCH FROM (acknowledged_at - created_at))) as avg_ack_seconds
-                FROM incidents
-                WHERE {where_sql} AND resolved_at IS NOT NULL
-            """, params)
-            timing = cursor.fetchone()
-
-        conn.close()
+        # Build base WHERE clause
+        where_clauses = []
+        params = []
+
+        if start_time:
+            where_clauses.append("created_at >= %s")
+            params.append(start_time)
+        if org_id:
+            where_clauses.append("organization_id = %s")
+            params.append(org_id)
+        if project_id:
+            where_clauses.append("project_id = %s")
+            params.append(project_id)
+
+        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+
+        counts, severity_counts = await _fetch_incident_stats(where_sql, params)
+        counts = dict(counts)
+        timing = {
+            "avg_resolution_seconds": counts.pop('avg_resolution_seconds'),
+            "avg_ack_seconds": counts.pop('avg_ack_seconds')
+        }
 
         # Return raw data - LLM handles formatting
         result = {
             "time_range": time_range,
-            "counts": dict(counts),
+            "counts": counts,
             "by_severity": [dict(row) for row in severity_counts],
-            "timing": {
-                "avg_resolution_seconds": timing['avg_resolution_seconds'],
-                "avg_ack_seconds": timing['avg_ack_seconds']
-            } if timing else None
+            "timing": timing
         }
         
-        return {"content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}]}
+        return {"content": [{"type": "text", "text": json.dumps(result, indent=2, default=_json_default)}]}
 
     except Exception as e:
         return {
@@ -433,67 +415,54 @@ async def _search_incidents_impl(args: dict[str, Any]) -> dict[str, Any]:
     project_id = args.get("project_id") or get_project_id()
 
     try:
-        conn = _get_db_connection()
-        with conn.cursor() as cursor:
-            # Build search query with ILIKE for simple search
-            # Could use full-text search (tsvector) for better results
-            search_pattern = f"%{query}%"
-
-            sql = """
-                SELECT
-                    i.id, i.title, i.description, i.status, i.severity,
-                    i.created_at, i.acknowledged_at, i.resolved_at,
-                    i.assigned_to,
-                    u.name as assigned_to_name,
-                    s.name as service_name
-                FROM incidents i
-                LEFT JOIN users u ON i.assigned_to = u.id
-                LEFT JOIN services s ON i.service_id = s.id
-                WHERE (i.title ILIKE %s OR i.description ILIKE %s)
-            """
-            params = [search_pattern, search_pattern]
-
-            if status != "all":
-                sql += " AND i.status = %s"
-                params.append(status)
-
-            if severity:
-                sql += " AND i.severity = %s"
-                params.append(severity)
-
-            if org_id:
-                sql += " AND i.organization_id = %s"
-                params.append(org_id)
-
-            if project_id:
-                sql += " AND i.project_id = %s"
-                params.append(project_id)
-
-            sql += " ORDER BY i.created_at DESC LIMIT %s"
-            params.append(limit)
-
-            cursor.execute(sql, params)
-            incidents = cursor.fetchall()
-
-        conn.close()
+        # Build search query with ILIKE for simple search
+        # Could use full-text search (tsvector) for better results
+        search_pattern = f"%{query}%"
+
+        sql = """
+            SELECT
+                i.id, i.title, i.description, i.status, i.severity,
+                i.created_at, i.acknowledged_at, i.resolved_at,
+                i.assigned_to,
+                u.name as assigned_to_name,
+                s.name as service_name
+            FROM incidents i
+            LEFT JOIN users u ON i.assigned_to = u.id
+            LEFT JOIN services s ON i.service_id = s.id
+            WHERE (i.title ILIKE %s OR i.description ILIKE %s)
+        """
+        params = [search_pattern, search_pattern]
+
+        if status != "all":
+            sql += " AND i.status = %s"
+            params.append(status)
+
+        if severity:
+            sql += " AND i.severity = %s"
+            params.append(severity)
+
+        if org_id:
+            sql += " AND i.organization_id = %s"
+            params.append(org_id)
+
+        if project_id:
+            sql += " AND i.project_id = %s"
+            params.append(project_id)
+
+        sql += " ORDER BY i.created_at DESC LIMIT %s"
+        params.append(limit)
+
+        incidents = await asyncio.to_thread(execute_query, sql, params)
 
         # Return raw data - LLM handles formatting
-        incidents_data = []
-        for inc in incidents:
-            inc_dict = dict(inc)
-            for key, value in inc_dict.items():
-                if hasattr(value, 'isoformat'):
-                    inc_dict[key] = value.isoformat()
-            incidents_data.append(inc_dict)
-        
         result = {
             "query": query,
             "filters": {"status": status, "severity": severity},
-            "count": len(incidents_data),
-            "incidents": incidents_data
+            "count": len(incidents),
+            "incidents": incidents
         }
         
-        return {"content": [{"type": "text", "text": json.dumps(result, indent=2, default=str)}]}
+        return {"content": [{"type": "text", "text": json.dumps(result, indent=2, default=_json_default)}]}
 
     except Exception as e:
         return {
@@ -570,9 +539,14 @@ INCIDENT_TOOLS = [
 ]
 
 
+@lru_cache(maxsize=1)
 def create_incident_tools_server():
     """
     Create and return an MCP server with incident management tools.
+
+    The server is built once per process: tool schemas are static and the
+    handlers read tenant context from ContextVars, so every session can
+    share the same instance.
     """
     return create_sdk_mcp_server(
         name="incident_tools", version="1.0.0", tools=INCIDENT_TOOLS
@@ -152,8 +152,8 @@ class MCPConfigManager:
             return {}
 
         try:
-            with open(mcp_file, "r", encoding="utf-8") as f:
-                mcp_config = json.load(f)
+            with open(mcp_file, "rb") as f:
+                mcp_config = json.loads(f.read())
 
             # Cache it
             self.cache.set(user_id, mcp_config)
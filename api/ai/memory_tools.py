@@ -5,18 +5,18 @@ Tools for managing project memory (CLAUDE.md) directly from the database.
 This allows the agent to update its own context/memory.
 """
 
+import asyncio
 import json
 import logging
 import os
+from functools import lru_cache
 from datetime import datetime
 from contextvars import ContextVar
 from typing import Any, Optional
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
 from claude_agent_sdk import create_sdk_mcp_server, tool
 
-from config import config
+from database_util import execute_query
 from workspace_service import sync_memory_to_workspace
 
 logger = logging.getLogger(__name__)
@@ -57,12 +57,20 @@ def get_user_id() -> str:
     return _user_id_ctx.get() or ""
 
 
-def _get_db_connection():
-    """Get database connection using centralized config."""
-    db_url = config.database_url
-    if not db_url:
-        raise Exception("DATABASE_URL not configured")
-    return psycopg2.connect(db_url, cursor_factory=RealDictCursor)
+def _upsert_memory(project_id: str, content: str, user_id: Optional[str]) -> None:
+    """Upsert a project's memory row (blocking - run via asyncio.to_thread)."""
+    execute_query(
+        """
+        INSERT INTO claude_memory (project_id, content, last_updated_by)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (project_id) DO UPDATE SET
+            content = EXCLUDED.content,
+            last_updated_by = EXCLUDED.last_updated_by,
+            updated_at = NOW()
+        """,
+        (project_id, content, user_id),
+        fetch="none"
+    )
 
 
 async def _update_memory_impl(args: dict[str, Any]) -> dict[str, Any]:
@@ -93,22 +101,7 @@ async def _update_memory_impl(args: dict[str, Any]) -> dict[str, Any]:
         }
 
     try:
-        conn = _get_db_connection()
-        with conn.cursor() as cursor:
-            # Upsert memory
-            cursor.execute(
-                """
-                INSERT INTO claude_memory (project_id, content, last_updated_by)
-                VALUES (%s, %s, %s)
-                ON CONFLICT (project_id) DO UPDATE SET
-                    content = EXCLUDED.content,
-                    last_updated_by = EXCLUDED.last_updated_by,
-                    updated_at = NOW()
-                """,
-                (project_id, content, user_id or None)
-            )
-            conn.commit()
-        conn.close()
+        await asyncio.to_thread(_upsert_memory, project_id, content, user_id or None)
 
         logger.info(f"Memory updated for project {project_id} by user {user_id} ({len(content)} chars)")
 
@@ -158,9 +151,14 @@ MEMORY_TOOLS = [
 ]
 
 
+@lru_cache(maxsize=1)
 def create_memory_tools_server():
     """
     Create and return an MCP server with memory management tools.
+
+    The server is built once per process: tool schemas are static and the
+    handlers read tenant context from ContextVars, so every session can
+    share the same instance.
     """
     return create_sdk_mcp_server(
         name="memory_tools", version="1.0.0", tools=MEMORY_TOOLS
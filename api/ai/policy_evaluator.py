@@ -29,9 +29,13 @@ Usage:
 
 import asyncio
 import fnmatch
+import heapq
 import logging
+import re
 import time
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 from typing import Optional
 
 import httpx
@@ -44,10 +48,19 @@ VERSION_CHECK_INTERVAL = 60.0
 # HTTP timeout for internal API calls
 HTTP_TIMEOUT = 5.0
 
+# fnmatch metacharacters - patterns without any are plain tool names
+_GLOB_CHARS = frozenset("*?[")
 
-@dataclass
+
+@lru_cache(maxsize=1024)
+def _compile_tool_pattern(pattern: str):
+    """Compile an fnmatch glob once; returns its bound regex match function."""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+@dataclass(frozen=True, slots=True)
 class Policy:
-    """Represents a single agent_policy row from the database."""
+    """Represents a single agent_policy row from the database (immutable)."""
     id: str
     org_id: str
     project_id: Optional[str]
@@ -72,12 +85,13 @@ class Policy:
         """Check if this policy's tool_pattern matches the given tool name."""
         if self.tool_pattern == "*":
             return True
-        return fnmatch.fnmatch(tool_name, self.tool_pattern)
+        # Tool names are not paths, so skip fnmatch's per-call normcase
+        return _compile_tool_pattern(self.tool_pattern)(tool_name) is not None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EvaluationResult:
-    """Result of evaluating policies for a tool invocation."""
+    """Result of evaluating policies for a tool invocation (immutable, may be shared)."""
     matched: bool
     effect: Optional[str]          # "allow" | "deny" | None
     policy_id: Optional[str]
@@ -85,6 +99,33 @@ class EvaluationResult:
     reason: str
 
 
+# Shared result for tools no policy applies to
+NO_MATCH = EvaluationResult(
+    matched=False, effect=None,
+    policy_id=None, policy_name=None,
+    reason="no matching policy"
+)
+
+
+def _parse_policy(raw: dict) -> Optional[Policy]:
+    """Parse a raw dict from the API into a Policy dataclass."""
+    try:
+        return Policy(
+            id=raw["id"],
+            org_id=raw["org_id"],
+            project_id=raw.get("project_id"),
+            effect=raw["effect"],
+            principal_type=raw["principal_type"],
+            principal_value=raw.get("principal_value"),
+            tool_pattern=raw.get("tool_pattern", "*"),
+            priority=int(raw.get("priority", 0)),
+            is_active=bool(raw.get("is_active", True)),
+        )
+    except (KeyError, ValueError, TypeError) as e:
+        logger.warning(f"PolicyEvaluator: failed to parse policy {raw}: {e}")
+        return None
+
+
 class PolicyEvaluator:
     """
     One instance per WebSocket session.
@@ -110,6 +151,21 @@ class PolicyEvaluator:
         self._loaded_at: float = 0.0
         self._user_role: Optional[str] = None  # cached once per session
 
+        # Derived from (cache, role) and rebuilt lazily after every (re)load:
+        # active policies for this principal, sorted by priority DESC, and
+        # memoized decisions keyed by tool name.
+        self._applicable: Optional[list[Policy]] = None
+        self._has_deny: bool = False
+        # Applicable policies split by pattern kind, each entry tagged with its
+        # position in _applicable so both halves merge back in priority order
+        self._exact_index: dict[str, list[tuple[int, Policy]]] = {}
+        self._glob_policies: list[tuple[int, Policy]] = []
+        self._policy_results: list[EvaluationResult] = []
+        self._decisions: dict[str, EvaluationResult] = {}
+
+        # In-flight staleness check shared by concurrent callers
+        self._refresh_task: Optional[asyncio.Task] = None
+
         # Shared async HTTP client
         self._client: Optional[httpx.AsyncClient] = None
 
@@ -127,6 +183,8 @@ class PolicyEvaluator:
 
     async def close(self):
         """Release the HTTP client. Call on session teardown."""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
         if self._client and not self._client.is_closed:
             await self._client.aclose()
 
@@ -139,6 +197,7 @@ class PolicyEvaluator:
             self._cache, self._version = await self._fetch_policies()
             self._loaded_at = time.monotonic()
             await self._resolve_role()
+            self._invalidate()
             logger.info(
                 f"🔐 PolicyEvaluator loaded {len(self._cache)} policies "
                 f"(v{self._version}) for org={self._org_id} role={self._user_role}"
@@ -146,6 +205,7 @@ class PolicyEvaluator:
         except Exception as e:
             logger.warning(f"PolicyEvaluator.load_for_session failed: {e} — proceeding without policies")
             self._cache = []
+            self._invalidate()
 
     # ------------------------------------------------------------------ #
     # Core Evaluation
@@ -156,69 +216,58 @@ class PolicyEvaluator:
         Evaluate all active policies for the given tool invocation.
 
         Algorithm:
-          1. Filter policies matching this principal AND this tool
-          2. Sort by priority DESC (explicit, not relying on cache order)
+          1. Walk policies matching this principal AND this tool
+          2. In priority DESC order (explicit, not relying on cache order)
           3. At each priority level, DENY beats ALLOW
           4. Return the first decision found
-        """
-        matching: list[Policy] = [
-            p for p in self._cache
-            if p is not None
-            and p.is_active
-            and p.matches_principal(self._user_id, self._user_role)
-            and p.matches_tool(tool_name)
-        ]
-
-        if not matching:
-            logger.debug(
-                f"PolicyEvaluator.evaluate: no matching policy for '{tool_name}' "
-                f"(user_role={self._user_role}, cache_size={len(self._cache)})"
-            )
-            return EvaluationResult(
-                matched=False, effect=None,
-                policy_id=None, policy_name=None,
-                reason="no matching policy"
-            )
 
-        # Sort explicitly by priority DESC so higher-priority policies are evaluated first.
-        # This is defensive: SQL also sorts DESC but we don't rely on it here.
-        matching.sort(key=lambda p: p.priority, reverse=True)
+        Decisions are memoized per tool name until the next policy reload.
+        """
+        cached = self._decisions.get(tool_name)
+        if cached is not None:
+            return cached
+
+        result = self._evaluate_uncached(tool_name)
+        self._decisions[tool_name] = result
+        return result
+
+    def _evaluate_uncached(self, tool_name: str) -> EvaluationResult:
+        """Run the full policy match for a tool name (see evaluate)."""
+        self._get_applicable()
+        # Exact-name policies are a dict hit; only glob patterns need fnmatch.
+        # Both sources are consumed lazily, so evaluation stops at the first
+        # decisive policy instead of matching every pattern up front.
+        candidates = heapq.merge(
+            self._exact_index.get(tool_name, ()),
+            (entry for entry in self._glob_policies if entry[1].matches_tool(tool_name)),
+        )
 
-        # Group by priority level and pick DENY > ALLOW within same level
+        # Highest priority level decides; DENY > ALLOW within that level
         best: Optional[Policy] = None
-        current_priority = matching[0].priority
-
-        for policy in matching:
-            if policy.priority < current_priority:
+        best_position = -1
+        for position, policy in candidates:
+            if best is not None and policy.priority < best.priority:
                 # We've already processed the highest priority level
                 break
             if policy.effect == "deny":
-                best = policy
+                best, best_position = policy, position
                 break  # DENY wins at this priority level, no need to look further
             if best is None:
-                best = policy  # tentative ALLOW
+                best, best_position = policy, position  # tentative ALLOW
 
         if best is None:
-            return EvaluationResult(
-                matched=False, effect=None,
-                policy_id=None, policy_name=None,
-                reason="no matching policy"
+            logger.debug(
+                f"PolicyEvaluator.evaluate: no matching policy for '{tool_name}' "
+                f"(user_role={self._user_role}, cache_size={len(self._cache)})"
             )
+            return NO_MATCH
 
-        reason = (
-            f"policy '{best.id}' ({best.effect}) "
-            f"principal={best.principal_type}:{best.principal_value} "
-            f"pattern={best.tool_pattern} "
-            f"priority={best.priority} "
-            f"(matched {len(matching)} policies, user_role={self._user_role})"
-        )
-        return EvaluationResult(
-            matched=True,
-            effect=best.effect,
-            policy_id=best.id,
-            policy_name=None,  # name not stored in Policy (avoid extra storage)
-            reason=reason,
-        )
+        return self._policy_results[best_position]
+
+    def has_deny_policies(self) -> bool:
+        """True if any active DENY policy applies to this principal (precomputed per load)."""
+        self._get_applicable()
+        return self._has_deny
 
     async def is_denied(self, tool_name: str) -> bool:
         """Convenience helper: True if any DENY policy matches (used to filter allowed_tools)."""
@@ -234,10 +283,20 @@ class PolicyEvaluator:
         Called at the start of each permission_callback invocation.
         Checks the remote version counter every VERSION_CHECK_INTERVAL seconds.
         If the version has changed, reloads the full policy cache.
+
+        Parallel tool calls arriving while a check is running await the same
+        in-flight check instead of each issuing their own version request.
         """
         if time.monotonic() - self._loaded_at < VERSION_CHECK_INTERVAL:
             return
 
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+        # shield: a cancelled callback must not cancel the shared check
+        await asyncio.shield(self._refresh_task)
+
+    async def _refresh(self):
+        """Version check + reload behind refresh_if_stale (one at a time)."""
         try:
             remote_version = await self._fetch_version()
             if remote_version != self._version:
@@ -256,6 +315,56 @@ class PolicyEvaluator:
     # Private Helpers
     # ------------------------------------------------------------------ #
 
+    def _invalidate(self):
+        """Drop state derived from the policy cache and user role."""
+        self._applicable = None
+        self._decisions.clear()
+
+    def _get_applicable(self) -> list[Policy]:
+        """Active policies for this principal, sorted by priority DESC (built once per load)."""
+        if self._applicable is None:
+            applicable = [
+                p for p in self._cache
+                if p is not None
+                and p.is_active
+                and p.matches_principal(self._user_id, self._user_role)
+            ]
+            # Sort explicitly by priority DESC so higher-priority policies are evaluated first.
+            # This is defensive: SQL also sorts DESC but we don't rely on it here.
+            # sort() is stable, so the per-tool subsets stay in priority order.
+            applicable.sort(key=attrgetter("priority"), reverse=True)
+            self._applicable = applicable
+            self._has_deny = any(p.effect == "deny" for p in applicable)
+
+            # Each policy's decision (including its reason text) depends only
+            # on the policy and the role, so build it once here rather than
+            # per evaluated tool name
+            self._policy_results = [
+                EvaluationResult(
+                    matched=True,
+                    effect=p.effect,
+                    policy_id=p.id,
+                    policy_name=None,  # name not stored in Policy (avoid extra storage)
+                    reason=(
+                        f"policy '{p.id}' ({p.effect}) "
+                        f"principal={p.principal_type}:{p.principal_value} "
+                        f"pattern={p.tool_pattern} "
+                        f"priority={p.priority} "
+                        f"(user_role={self._user_role})"
+                    ),
+                )
+                for p in applicable
+            ]
+
+            self._exact_index = {}
+            self._glob_policies = []
+            for position, p in enumerate(applicable):
+                if _GLOB_CHARS.isdisjoint(p.tool_pattern):
+                    self._exact_index.setdefault(p.tool_pattern, []).append((position, p))
+                else:
+                    self._glob_policies.append((position, p))
+        return self._applicable
+
     async def _fetch_policies(self) -> tuple[list[Policy], int]:
         """Fetch active policies from Go API internal endpoint."""
         client = await self._get_client()
@@ -271,7 +380,7 @@ class PolicyEvaluator:
         policies = [
             parsed for raw in raw_policies
             if raw
-            for parsed in [self._parse_policy(raw)]
+            for parsed in [_parse_policy(raw)]
             if parsed is not None
         ]
 
@@ -310,22 +419,3 @@ class PolicyEvaluator:
             self._user_role = None
         finally:
             await authz.close()
-
-    @staticmethod
-    def _parse_policy(raw: dict) -> Optional[Policy]:
-        """Parse a raw dict from the API into a Policy dataclass."""
-        try:
-            return Policy(
-                id=raw["id"],
-                org_id=raw["org_id"],
-                project_id=raw.get("project_id"),
-                effect=raw["effect"],
-                principal_type=raw["principal_type"],
-                principal_value=raw.get("principal_value"),
-                tool_pattern=raw.get("tool_pattern", "*"),
-                priority=int(raw.get("priority", 0)),
-                is_active=bool(raw.get("is_active", True)),
-            )
-        except (KeyError, ValueError, TypeError) as e:
-            logger.warning(f"PolicyEvaluator: failed to parse policy {raw}: {e}")
-            return None
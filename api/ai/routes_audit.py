@@ -5,8 +5,6 @@ Provides endpoints to query and export audit logs.
 Split from claude_agent_api_v1.py for better code organization.
 """
 
-import csv
-import io
 import logging
 from datetime import datetime, timedelta
 
@@ -15,7 +13,8 @@ from fastapi.responses import StreamingResponse
 from typing import Optional
 
 from dependencies import get_auth_context, AuthContext
-from database_util import execute_query
+from csv_export import stream_csv
+from database_util import execute_query, iter_query
 
 logger = logging.getLogger(__name__)
 
@@ -371,35 +370,28 @@ async def export_audit_logs(
             LIMIT 10000
         """
 
-        logs = execute_query(query, tuple(params), fetch="all") or []
-
-        # Generate CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Write header
-        writer.writerow([
-            "Event ID",
-            "Timestamp",
-            "Event Type",
-            "Category",
-            "User ID",
-            "User Email",
-            "Org ID",
-            "Session ID",
-            "Action",
-            "Resource Type",
-            "Resource ID",
-            "Status",
-            "Error Code",
-            "Error Message",
-            "Duration (ms)",
-            "Source IP",
-        ])
-
-        # Write rows
-        for log in logs:
-            writer.writerow([
+        # Stream rows through a server-side cursor
+        body = stream_csv(
+            iter_query(query, tuple(params)),
+            header=[
+                "Event ID",
+                "Timestamp",
+                "Event Type",
+                "Category",
+                "User ID",
+                "User Email",
+                "Org ID",
+                "Session ID",
+                "Action",
+                "Resource Type",
+                "Resource ID",
+                "Status",
+                "Error Code",
+                "Error Message",
+                "Duration (ms)",
+                "Source IP",
+            ],
+            to_row=lambda log: [
                 log.get("event_id", ""),
                 log.get("event_time", "").isoformat() if log.get("event_time") else "",
                 log.get("event_type", ""),
@@ -416,13 +408,12 @@ async def export_audit_logs(
                 log.get("error_message", ""),
                 log.get("duration_ms", ""),
                 log.get("source_ip", ""),
-            ])
-
-        output.seek(0)
+            ],
+        )
 
         # Return as streaming response
         return StreamingResponse(
-            iter([output.getvalue()]),
+            body,
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename=audit-logs-{datetime.utcnow().strftime('%Y-%m-%d')}.csv"
@@ -12,6 +12,7 @@ Endpoints:
 - DELETE /api/conversations/{conversation_id} - Delete conversation
 """
 
+import asyncio
 import json
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Query
@@ -175,7 +176,8 @@ async def save_message(
         True if saved successfully, False otherwise
     """
     try:
-        execute_query(
+        await asyncio.to_thread(
+            execute_query,
             """
             INSERT INTO claude_messages
             (conversation_id, role, content, message_type, tool_name, tool_input, metadata)
@@ -3,8 +3,6 @@ Cost tracking routes for AI Agent API (REFACTORED with dependency injection).
 Provides endpoints to query and export AI cost logs (project-scoped).
 """
 
-import io
-import csv
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -12,7 +10,8 @@ from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 
 from dependencies import require_project_context, AuthContext
-from database_util import execute_query
+from csv_export import stream_csv
+from database_util import execute_query, iter_query
 
 router = APIRouter()
 
@@ -299,31 +298,24 @@ async def export_cost_logs(
         LIMIT 10000
     """
 
-    logs = execute_query(query, tuple(params), fetch="all")
-
-    # Generate CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Header
-    writer.writerow([
-        "Timestamp",
-        "User",
-        "Message ID",
-        "Model",
-        "Request Type",
-        "Step Number",
-        "Input Tokens",
-        "Output Tokens",
-        "Total Tokens",
-        "Cost (USD)",
-        "Session ID",
-        "Conversation ID",
-    ])
-
-    # Data rows
-    for log in logs or []:
-        writer.writerow([
+    # Stream rows through a server-side cursor
+    body = stream_csv(
+        iter_query(query, tuple(params)),
+        header=[
+            "Timestamp",
+            "User",
+            "Message ID",
+            "Model",
+            "Request Type",
+            "Step Number",
+            "Input Tokens",
+            "Output Tokens",
+            "Total Tokens",
+            "Cost (USD)",
+            "Session ID",
+            "Conversation ID",
+        ],
+        to_row=lambda log: [
             log.get("created_at", "").isoformat() if log.get("created_at") else "",
             log.get("user_email", ""),
             log.get("message_id", ""),
@@ -336,14 +328,13 @@ async def export_cost_logs(
             f"{log.get('total_cost_usd', 0):.6f}",
             log.get("session_id", ""),
             log.get("conversation_id", ""),
-        ])
-
-    output.seek(0)
+        ],
+    )
 
     filename = f"cost-logs-{datetime.utcnow().strftime('%Y-%m-%d')}.csv"
 
     return StreamingResponse(
-        iter([output.getvalue()]),
+        body,
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
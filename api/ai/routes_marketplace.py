@@ -21,6 +21,7 @@ import logging
 import re
 import shutil
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -33,6 +34,7 @@ from workspace_service import (
     extract_user_id_from_token,
 )
 from database_util import execute_query, ensure_user_exists, extract_user_info_from_token, resolve_user_id_from_token
+from config_loader import YAML_LOADER
 from git_utils import (
     build_github_url,
     clone_repository,
@@ -65,11 +67,26 @@ def parse_yaml_frontmatter(file_path: Path) -> Optional[dict]:
     ---
     # Content...
 
+    Parses are memoized on (path, mtime, size), so rescanning an unchanged
+    marketplace reuses them; the returned dict is shared and must not be
+    mutated.
+
     Returns:
         dict with frontmatter fields, or None if parsing fails
     """
     try:
-        content = file_path.read_text(encoding='utf-8')
+        st = file_path.stat()
+    except OSError as e:
+        logger.warning(f"Failed to parse YAML frontmatter from {file_path}: {e}")
+        return None
+    return _parse_yaml_frontmatter_cached(str(file_path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=1024)
+def _parse_yaml_frontmatter_cached(path: str, mtime_ns: int, size: int) -> Optional[dict]:
+    """Read and parse one SKILL.md version (see parse_yaml_frontmatter)."""
+    try:
+        content = Path(path).read_text(encoding='utf-8')
 
         # Check for YAML frontmatter markers
         if not content.startswith('---'):
@@ -82,14 +99,14 @@ def parse_yaml_frontmatter(file_path: Path) -> Optional[dict]:
 
         # Extract and parse YAML
         yaml_content = content[3:end_marker].strip()
-        frontmatter = yaml.safe_load(yaml_content)
+        frontmatter = yaml.load(yaml_content, Loader=YAML_LOADER)
 
         if not isinstance(frontmatter, dict):
             return None
 
         return frontmatter
     except Exception as e:
-        logger.warning(f"Failed to parse YAML frontmatter from {file_path}: {e}")
+        logger.warning(f"Failed to parse YAML frontmatter from {path}: {e}")
         return None
 
 
@@ -681,7 +698,7 @@ async def clone_marketplace(request: Request):
 
         if marketplace_json_path.exists():
             try:
-                marketplace_metadata = json.loads(marketplace_json_path.read_text())
+                marketplace_metadata = json.loads(marketplace_json_path.read_bytes())
                 logger.info(f"Parsed marketplace.json: {marketplace_metadata.get('name')}")
             except Exception as e:
                 logger.warning(f"Failed to parse marketplace.json: {e}")
@@ -838,7 +855,7 @@ async def refresh_marketplace_skills(request: Request):
             }
 
         try:
-            marketplace_metadata = json.loads(marketplace_json_path.read_text())
+            marketplace_metadata = json.loads(marketplace_json_path.read_bytes())
         except Exception as e:
             logger.error(f"Failed to parse marketplace.json for '{marketplace_name}': {e}")
             return {
@@ -985,7 +1002,7 @@ async def update_marketplace(request: Request):
             marketplace_metadata = None
             if marketplace_json_path.exists():
                 try:
-                    marketplace_metadata = json.loads(marketplace_json_path.read_text())
+                    marketplace_metadata = json.loads(marketplace_json_path.read_bytes())
                     raw_plugins = marketplace_metadata.get("plugins", [])
                     enriched_plugins = enrich_plugins_with_skills(marketplace_dir, raw_plugins)
                     marketplace_metadata["plugins"] = enriched_plugins
@@ -1063,7 +1080,7 @@ async def update_marketplace(request: Request):
 
         if marketplace_json_path.exists():
             try:
-                marketplace_metadata = json.loads(marketplace_json_path.read_text())
+                marketplace_metadata = json.loads(marketplace_json_path.read_bytes())
                 logger.info(f"Read marketplace.json: {marketplace_metadata.get('name')}")
 
                 # Always re-discover skills for each plugin
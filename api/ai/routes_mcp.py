@@ -20,6 +20,27 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["mcp"])
 
+# Reference to shared cache (set by main app)
+user_mcp_cache = {}
+
+
+def set_mcp_cache(cache: dict):
+    """Set reference to shared MCP cache from main app."""
+    global user_mcp_cache
+    user_mcp_cache = cache
+
+
+def invalidate_mcp_cache(user_id: str, project_id: Optional[str] = None):
+    """Drop cached MCP configs affected by a server change.
+
+    Project servers are visible to every member, so a project-scoped change
+    clears the whole cache rather than just the caller's entry.
+    """
+    if project_id:
+        user_mcp_cache.clear()
+    else:
+        user_mcp_cache.pop(user_id, None)
+
 
 # ============================================================================
 # Pydantic Schemas (Request/Response Models)
@@ -269,6 +290,7 @@ async def create_mcp_server(
             )
 
         execute_query(query, params, fetch="none")
+        invalidate_mcp_cache(ctx.user_id, final_project_id)
 
         logger.info(
             f"Saved MCP server ({request.server_type}): {request.server_name} "
@@ -334,6 +356,8 @@ async def delete_mcp_server(
             )
             logger.info(f"Deleted MCP server: {server_name} for user {ctx.user_id}")
 
+        invalidate_mcp_cache(ctx.user_id, ctx.project_id)
+
         return MCPServerDeleteResponse(
             success=True,
             message=f"Server {server_name} deleted successfully"
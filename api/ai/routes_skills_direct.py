@@ -347,9 +347,10 @@ async def install_skill_from_url(request: Request):
 
         if not skill_md_path.exists():
             # Fallback: search for SKILL.md in subdirectories
-            skill_md_files = list(skill_dir.rglob("SKILL.md"))
-            if skill_md_files:
-                skill_md_path = skill_md_files[0]
+            # (rglob is lazy - stop at the first hit instead of walking the whole clone)
+            first_skill_md = next(skill_dir.rglob("SKILL.md"), None)
+            if first_skill_md:
+                skill_md_path = first_skill_md
             else:
                 logger.warning(f"SKILL.md not found in {skill_dir}")
 
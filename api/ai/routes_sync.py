@@ -11,6 +11,7 @@ NOTE: Bucket sync removed - plugins now come from git clone, MCP from PostgreSQL
 """
 
 import logging
+import time
 from fastapi import APIRouter, Request
 
 from workspace_service import (
@@ -162,6 +163,8 @@ async def sync_marketplaces(request: Request):
 
         workspace_path = get_user_workspace_path(user_id)
         results = []
+        updated_count = 0
+        total_success = 0
 
         for mp in marketplaces:
             mp_name = mp["name"]
@@ -201,6 +204,9 @@ async def sync_marketplaces(request: Request):
                     "had_changes": had_changes,
                     "commit_sha": result,
                 })
+                total_success += 1
+                if had_changes:
+                    updated_count += 1
             else:
                 logger.error(f"Failed to sync marketplace '{mp_name}': {result}")
                 results.append({
@@ -209,9 +215,6 @@ async def sync_marketplaces(request: Request):
                     "error": "Failed to sync marketplace. Check server logs for details.",
                 })
 
-        updated_count = sum(1 for r in results if r.get("success") and r.get("had_changes"))
-        total_success = sum(1 for r in results if r.get("success"))
-
         logger.info(f"Marketplace sync complete: {updated_count} updated, {total_success}/{len(marketplaces)} successful")
 
         return {
@@ -265,7 +268,7 @@ async def sync_mcp_config(request: Request):
 
         if user_mcp_servers:
             # Update cache
-            user_mcp_cache[user_id] = user_mcp_servers
+            user_mcp_cache[user_id] = (time.monotonic(), user_mcp_servers)
             logger.info(f"Config synced and cached for user: {user_id}")
             logger.info(f"   Servers: {list(user_mcp_servers.keys())}")
 
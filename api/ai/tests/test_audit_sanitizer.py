@@ -0,0 +1,39 @@
+"""
+Test DataSanitizer - secret redaction for audit records.
+
+Verifies:
+- Secret patterns are redacted before long strings are truncated
+- A secret straddling the truncation point is not stored in clear
+"""
+
+import pytest
+
+from audit_service import DataSanitizer
+
+
+class TestSanitizeString:
+    """Test redaction and truncation of long strings."""
+
+    def test_long_string_is_truncated(self):
+        value = "x" * (DataSanitizer.MAX_STRING_LENGTH + 500)
+        result = DataSanitizer._sanitize_string(value)
+        assert result.startswith("x" * DataSanitizer.MAX_STRING_LENGTH)
+        assert result.endswith(f"[TRUNCATED: {len(value)} chars total]")
+
+    @pytest.mark.parametrize("key_start", [
+        DataSanitizer.MAX_STRING_LENGTH - 10,
+        # Far enough past the cut that only earlier redactions pull it in
+        DataSanitizer.MAX_STRING_LENGTH + 1020,
+    ])
+    def test_secret_straddling_the_cut_is_redacted(self, key_start):
+        # Each leading key shrinks when redacted, pulling later text forward
+        leading_key = "sk-" + "A" * 32 + " "
+        prefix = leading_key * (key_start // len(leading_key))
+        prefix += "y" * (key_start - len(prefix))
+        straddling_key = "sk-" + "B" * 32
+        value = prefix + straddling_key + " " + "z" * 5000
+
+        result = DataSanitizer._sanitize_string(value)
+
+        assert "sk-" not in result
+        assert "BBBB" not in result
@@ -0,0 +1,46 @@
+"""
+Test csv_export - chunked CSV bodies for streaming exports.
+
+Verifies:
+- Header and mapped rows are written, split every CSV_CHUNK_ROWS rows
+- An empty result still yields the header
+- Errors from the first row are raised before the body is consumed
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+import csv_export
+from csv_export import stream_csv
+
+
+def _to_row(row):
+    return [row["id"], row["name"]]
+
+
+class TestStreamCsv:
+    """Test chunking and first-row error handling."""
+
+    def test_rows_are_chunked(self):
+        rows = iter([{"id": i, "name": f"n{i}"} for i in range(1, 6)])
+
+        with patch.object(csv_export, "CSV_CHUNK_ROWS", 2):
+            chunks = list(stream_csv(rows, ["ID", "Name"], _to_row))
+
+        assert chunks == [
+            "ID,Name\r\n1,n1\r\n2,n2\r\n",
+            "3,n3\r\n4,n4\r\n",
+            "5,n5\r\n",
+        ]
+
+    def test_empty_result_yields_header(self):
+        assert "".join(stream_csv(iter([]), ["ID", "Name"], _to_row)) == "ID,Name\r\n"
+
+    def test_query_error_raises_before_streaming(self):
+        def failing_rows():
+            raise RuntimeError("query failed")
+            yield  # pragma: no cover
+
+        with pytest.raises(RuntimeError):
+            stream_csv(failing_rows(), ["ID", "Name"], _to_row)
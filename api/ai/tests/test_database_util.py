@@ -0,0 +1,125 @@
+"""
+Test database_util connection pooling.
+
+The psycopg2 pool is mocked, so no database is needed. Verifies:
+- Borrowed connections are committed on success and returned to the pool
+- Errors roll back, re-raise and still return the connection
+- Broken connections are discarded by the pool
+- Dead idle connections are replaced before use; recently used ones are not pinged
+- An exhausted pool falls back to a one-off connection
+- The pool keeps DB_POOL_MIN idle connections
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from psycopg2.pool import PoolError
+
+import database_util
+
+
+@pytest.fixture
+def pool():
+    pool = MagicMock()
+    conn = MagicMock(closed=0)
+    pool.getconn.return_value = conn
+    # Recently returned, so checkout skips the liveness ping
+    with patch.object(database_util, "_get_pool", return_value=pool), \
+         patch.dict(database_util._last_used, {id(conn): time.monotonic()}):
+        yield pool
+
+
+class TestGetDbConnection:
+    """Test transaction handling around pooled connections."""
+
+    def test_success_commits_and_returns_connection(self, pool):
+        with database_util.get_db_connection() as conn:
+            assert conn is pool.getconn.return_value
+
+        conn.commit.assert_called_once()
+        conn.rollback.assert_not_called()
+        pool.putconn.assert_called_once_with(conn, close=False)
+
+    def test_error_rolls_back_and_returns_connection(self, pool):
+        with pytest.raises(ValueError):
+            with database_util.get_db_connection() as conn:
+                raise ValueError("boom")
+
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+        pool.putconn.assert_called_once_with(conn, close=False)
+
+    def test_broken_connection_is_discarded(self, pool):
+        conn = pool.getconn.return_value
+        conn.rollback.side_effect = database_util.psycopg2.InterfaceError("closed")
+
+        with pytest.raises(database_util.psycopg2.OperationalError):
+            with database_util.get_db_connection() as conn:
+                conn.closed = 2
+                raise database_util.psycopg2.OperationalError("server closed the connection")
+
+        pool.putconn.assert_called_once_with(conn, close=True)
+
+    def test_dead_idle_connection_is_replaced(self, pool):
+        dead = MagicMock(closed=0)
+        dead.cursor.return_value.__enter__.return_value.execute.side_effect = (
+            database_util.psycopg2.OperationalError("server closed the connection")
+        )
+        fresh = MagicMock(closed=0)
+        pool.getconn.side_effect = [dead, fresh]
+        database_util._last_used[id(dead)] = time.monotonic() - database_util.DB_POOL_PING_AFTER - 1
+
+        with database_util.get_db_connection() as conn:
+            assert conn is fresh
+
+        pool.putconn.assert_any_call(dead, close=True)
+        pool.putconn.assert_called_with(fresh, close=False)
+        fresh.commit.assert_called_once()
+
+    def test_closed_connection_is_replaced_without_ping(self, pool):
+        closed = MagicMock(closed=1)
+        fresh = MagicMock(closed=0)
+        pool.getconn.side_effect = [closed, fresh]
+
+        with database_util.get_db_connection() as conn:
+            assert conn is fresh
+
+        closed.cursor.assert_not_called()
+        pool.putconn.assert_any_call(closed, close=True)
+
+    def test_recently_used_connection_is_not_pinged(self, pool):
+        with database_util.get_db_connection() as conn:
+            pass
+
+        conn.cursor.assert_not_called()
+
+    def test_exhausted_pool_uses_one_off_connection(self, pool):
+        pool.getconn.side_effect = PoolError("connection pool exhausted")
+        one_off = MagicMock()
+
+        with patch.object(database_util.psycopg2, "connect", return_value=one_off):
+            with database_util.get_db_connection() as conn:
+                assert conn is one_off
+
+        one_off.commit.assert_called_once()
+        one_off.close.assert_called_once()
+        pool.putconn.assert_not_called()
+
+
+class TestGetPool:
+    """Test lazy pool creation."""
+
+    def test_pool_keeps_min_idle_connections(self):
+        with patch.object(database_util, "_pool", None), \
+             patch.object(database_util, "ThreadedConnectionPool") as pool_cls, \
+             patch.object(database_util.config, "database_url", "postgresql://test"), \
+             patch.object(database_util.atexit, "register"):
+            assert database_util._get_pool() is pool_cls.return_value
+            assert database_util._get_pool() is pool_cls.return_value
+
+        pool_cls.assert_called_once_with(
+            minconn=database_util.DB_POOL_MIN,
+            maxconn=database_util.DB_POOL_MAX,
+            dsn="postgresql://test",
+        )
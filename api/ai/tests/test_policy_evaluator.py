@@ -0,0 +1,189 @@
+"""
+Test PolicyEvaluator - declarative tool access control.
+
+Policies are injected directly into the evaluator cache, so no Go API
+is needed. Verifies:
+- DENY beats ALLOW at the same priority, higher priority wins
+- Principal matching (wildcard, user, role)
+- Decision memoization and invalidation on reload
+- Coalescing of concurrent staleness checks
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+
+from policy_evaluator import VERSION_CHECK_INTERVAL, Policy, PolicyEvaluator
+
+from tests.test_data import ORG_ALPHA_ID, USER_ORG_MEMBER_ID, USER_ORG_VIEWER_ID
+
+
+def _policy(policy_id: str, effect: str, tool_pattern: str, priority: int = 0,
+            principal_type: str = "*", principal_value: str = None) -> Policy:
+    return Policy(
+        id=policy_id,
+        org_id=ORG_ALPHA_ID,
+        project_id=None,
+        effect=effect,
+        principal_type=principal_type,
+        principal_value=principal_value,
+        tool_pattern=tool_pattern,
+        priority=priority,
+        is_active=True,
+    )
+
+
+def _evaluator(policies, user_role: str = "member") -> PolicyEvaluator:
+    evaluator = PolicyEvaluator(
+        org_id=ORG_ALPHA_ID,
+        project_id=None,
+        user_id=USER_ORG_MEMBER_ID,
+        go_api_url="http://go-api:8080",
+    )
+    evaluator._cache = list(policies)
+    evaluator._user_role = user_role
+    return evaluator
+
+
+# ============================================================
+# 1. Conflict resolution
+# ============================================================
+
+class TestEvaluate:
+    """Test policy matching and conflict resolution."""
+
+    @pytest.mark.asyncio
+    async def test_no_policies_falls_through(self):
+        result = await _evaluator([]).evaluate("Bash")
+        assert result.matched is False
+        assert result.effect is None
+
+    @pytest.mark.asyncio
+    async def test_deny_beats_allow_at_same_priority(self):
+        evaluator = _evaluator([
+            _policy("p-allow", "allow", "Bash", priority=10),
+            _policy("p-deny", "deny", "Bash", priority=10),
+        ])
+        result = await evaluator.evaluate("Bash")
+        assert result.matched is True
+        assert result.effect == "deny"
+        assert result.policy_id == "p-deny"
+
+    @pytest.mark.asyncio
+    async def test_higher_priority_allow_beats_lower_deny(self):
+        evaluator = _evaluator([
+            _policy("p-deny", "deny", "mcp__*", priority=1),
+            _policy("p-allow", "allow", "mcp__incident_tools__*", priority=5),
+        ])
+        result = await evaluator.evaluate("mcp__incident_tools__get_incident_stats")
+        assert result.effect == "allow"
+        assert result.policy_id == "p-allow"
+
+    @pytest.mark.asyncio
+    async def test_exact_and_glob_policies_merge_by_priority(self):
+        evaluator = _evaluator([
+            _policy("p-exact-deny", "deny", "mcp__incident_tools__get_incident_stats", priority=1),
+            _policy("p-glob-allow", "allow", "mcp__incident_tools__*", priority=5),
+            _policy("p-exact-allow", "allow", "Write", priority=1),
+            _policy("p-glob-deny", "deny", "W*", priority=10),
+        ])
+        stats = await evaluator.evaluate("mcp__incident_tools__get_incident_stats")
+        assert stats.policy_id == "p-glob-allow"
+        write = await evaluator.evaluate("Write")
+        assert write.policy_id == "p-glob-deny"
+
+    @pytest.mark.asyncio
+    async def test_glob_pattern_does_not_match_other_tools(self):
+        evaluator = _evaluator([_policy("p-deny", "deny", "mcp__bash__*")])
+        assert await evaluator.is_denied("mcp__bash__run") is True
+        assert await evaluator.is_denied("Read") is False
+
+    @pytest.mark.asyncio
+    async def test_principal_matching(self):
+        evaluator = _evaluator([
+            _policy("p-user", "deny", "Write", principal_type="user",
+                    principal_value=USER_ORG_VIEWER_ID),
+            _policy("p-role", "deny", "Edit", principal_type="role",
+                    principal_value="member"),
+        ])
+        assert await evaluator.is_denied("Write") is False
+        assert await evaluator.is_denied("Edit") is True
+
+    def test_has_deny_policies(self):
+        assert _evaluator([_policy("p-allow", "allow", "*")]).has_deny_policies() is False
+        assert _evaluator([_policy("p-deny", "deny", "Bash")]).has_deny_policies() is True
+        # DENY for another role does not apply to this principal
+        other_role = _policy("p-deny", "deny", "Bash", principal_type="role", principal_value="viewer")
+        assert _evaluator([other_role]).has_deny_policies() is False
+
+
+# ============================================================
+# 2. Decision cache
+# ============================================================
+
+class TestDecisionCache:
+    """Test memoization of evaluation results."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_evaluation_is_memoized(self):
+        evaluator = _evaluator([_policy("p-deny", "deny", "Bash")])
+        first = await evaluator.evaluate("Bash")
+        second = await evaluator.evaluate("Bash")
+        assert first is second
+
+    @pytest.mark.asyncio
+    async def test_reload_invalidates_decisions(self):
+        evaluator = _evaluator([_policy("p-deny", "deny", "Bash")])
+        assert await evaluator.is_denied("Bash") is True
+
+        evaluator._fetch_policies = AsyncMock(
+            return_value=([_policy("p-allow", "allow", "Bash")], 2)
+        )
+        evaluator._resolve_role = AsyncMock()
+        await evaluator.load_for_session()
+
+        result = await evaluator.evaluate("Bash")
+        assert result.effect == "allow"
+
+
+# ============================================================
+# 3. Refresh coalescing
+# ============================================================
+
+class TestRefreshIfStale:
+    """Test that concurrent staleness checks share one request."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_cache_skips_version_check(self):
+        evaluator = _evaluator([])
+        evaluator._loaded_at = time.monotonic()
+        evaluator._fetch_version = AsyncMock(return_value=1)
+        await evaluator.refresh_if_stale()
+        evaluator._fetch_version.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checks_are_coalesced(self):
+        evaluator = _evaluator([])
+        evaluator._version = 1
+        evaluator._loaded_at = time.monotonic() - VERSION_CHECK_INTERVAL - 1
+
+        async def slow_version():
+            await asyncio.sleep(0.01)
+            return 1
+
+        evaluator._fetch_version = AsyncMock(side_effect=slow_version)
+        await asyncio.gather(*(evaluator.refresh_if_stale() for _ in range(5)))
+        assert evaluator._fetch_version.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_cache_waits_for_version_check(self):
+        evaluator = _evaluator([])
+        evaluator._version = 1
+        evaluator._loaded_at = time.monotonic() - VERSION_CHECK_INTERVAL - 1
+        evaluator._fetch_version = AsyncMock(return_value=1)
+
+        await evaluator.refresh_if_stale()
+        assert evaluator._fetch_version.await_count == 1
+        assert time.monotonic() - evaluator._loaded_at < VERSION_CHECK_INTERVAL
@@ -0,0 +1,38 @@
+"""
+Test get_user_workspace_path - workspace containment.
+
+Verifies:
+- Non-UUID user ids are rejected
+- A workspace later replaced by a symlink outside the root is rejected
+"""
+
+import pytest
+
+import workspace_service
+from workspace_service import get_user_workspace_path
+
+from tests.test_data import USER_ORG_MEMBER_ID
+
+
+def test_rejects_non_uuid_user_id():
+    with pytest.raises(ValueError):
+        get_user_workspace_path("../etc")
+
+
+def test_symlink_swap_is_detected_on_later_calls(tmp_path, monkeypatch):
+    root = tmp_path / "workspaces"
+    root.mkdir()
+    monkeypatch.setattr(workspace_service, "USER_WORKSPACES_DIR", str(root))
+
+    workspace = root / USER_ORG_MEMBER_ID
+    workspace.mkdir()
+    assert get_user_workspace_path(USER_ORG_MEMBER_ID) == workspace.resolve()
+
+    # Agent replaces its workspace with a link pointing outside the root
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    workspace.rmdir()
+    workspace.symlink_to(outside)
+
+    with pytest.raises(ValueError):
+        get_user_workspace_path(USER_ORG_MEMBER_ID)
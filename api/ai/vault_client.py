@@ -11,18 +11,31 @@ Features:
 - Support for both authenticated and public repository access
 """
 
+import importlib.util
 import os
 import logging
 from typing import Optional, Dict, Any
 from pathlib import Path
 
-try:
-    import hvac
-    HVAC_AVAILABLE = True
-except ImportError:
-    HVAC_AVAILABLE = False
+# hvac (and the requests stack beneath it) is only needed once a client is
+# created, so only check that it is installed at import time and load it
+# on first use - keeps it off the service cold-start path.
+HVAC_AVAILABLE = importlib.util.find_spec("hvac") is not None
+if not HVAC_AVAILABLE:
     logging.warning("⚠️  hvac library not available. Install with: pip install hvac")
 
+hvac = None  # bound by _import_hvac()
+
+
+def _import_hvac():
+    """Import hvac on first use and bind it as a module global."""
+    global hvac
+    if hvac is None:
+        import hvac as _hvac
+        hvac = _hvac
+    return hvac
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,7 +67,7 @@ class VaultClient:
         self.vault_role = vault_role or os.getenv("VAULT_ROLE", "slar-ai-agent")
         self.vault_token = vault_token or os.getenv("VAULT_TOKEN")
         
-        self.client: Optional[hvac.Client] = None
+        self.client: Optional["hvac.Client"] = None
         self.enabled = os.getenv("VAULT_ENABLED", "true").lower() in ("true", "1", "yes")
         
         if not HVAC_AVAILABLE:
@@ -70,6 +83,7 @@ class VaultClient:
     
     def _authenticate(self):
         """Authenticate with Vault using available method."""
+        _import_hvac()
         try:
             self.client = hvac.Client(url=self.vault_addr)
             
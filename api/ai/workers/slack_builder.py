@@ -1,6 +1,29 @@
 import re
 from typing import Optional, Dict, Any, List
 
+# Common status markers in titles, e.g. "[Resolved] CPU high" (case-insensitive)
+TITLE_STATUS_PATTERN = re.compile(
+    r'\[(?:triggered|acknowledged|resolved|closed|warning|alert|critical|ok|no data)\]',
+    re.IGNORECASE,
+)
+
+# Status display mapping
+STATUS_DISPLAY = {
+    'triggered': 'Triggered',
+    'acknowledged': 'Acknowledged',
+    'resolved': 'Resolved',
+    'closed': 'Closed',
+    'escalated': 'Escalated'
+}
+
+STATUS_EMOJI = {
+    'triggered': ":fire:",
+    'acknowledged': ":large_yellow_circle:",
+    'resolved': ":white_check_mark:",
+    'closed': ":lock:",
+    'escalated': ":zap:"
+}
+
 class SlackMessage:
     def __init__(self, incident_data: Dict):
         self.incident_data = incident_data
@@ -83,21 +106,7 @@ class SlackMessageBuilder:
 
     def title_contains_status(self, title: str) -> bool:
         """Check if incident title already contains status information"""
-        # Check for common status patterns in titles (case-insensitive)
-        status_patterns = [
-            r'\[triggered\]',
-            r'\[acknowledged\]',
-            r'\[resolved\]',
-            r'\[closed\]',
-            r'\[warning\]',
-            r'\[alert\]',
-            r'\[critical\]',
-            r'\[ok\]',
-            r'\[no data\]'
-        ]
-
-        title_lower = title.lower()
-        return any(re.search(pattern, title_lower) for pattern in status_patterns)
+        return TITLE_STATUS_PATTERN.search(title) is not None
 
     def format_incident_blocks(self, incident_data: Dict, notification_msg: Dict, status_override: str = None, routed_teams: str = "unknown") -> List[Dict]:
         """Format incident as Slack top-level blocks (Block Kit) - Compact version"""
@@ -112,34 +121,13 @@ class SlackMessageBuilder:
         status = (status_override or incident_data.get('status', 'triggered')).lower()
         alert_status = incident_message.get_incident_alert_status()
 
-        # Status display mapping
-        status_display = {
-            'triggered': 'Triggered',
-            'acknowledged': 'Acknowledged',
-            'resolved': 'Resolved',
-            'closed': 'Closed',
-            'escalated': 'Escalated'
-        }
-
-        emoji_mapping = {
-            'triggered': ":fire:",
-            'acknowledged': ":large_yellow_circle:",
-            'resolved': ":white_check_mark:",
-            'closed': ":lock:",
-            'escalated': ":zap:"
-        }
-
-        status_emoji = emoji_mapping.get(status, ":question:")
+        status_emoji = STATUS_EMOJI.get(status, ":question:")
 
         # Check if title already contains status information
-        status_values = list(status_display.values())
-        # We also need to check lower case versions as title_has_status logic
-        title_has_status = any(f"[{s}]" in title.lower() for s in status_values) 
-
         if self.title_contains_status(title):
              header_prefix = f"{status_emoji} "
         else:
-             header_prefix = f"{status_emoji} *{status_display.get(status, 'Unknown')}* • {priority} • "
+             header_prefix = f"{status_emoji} *{STATUS_DISPLAY.get(status, 'Unknown')}* • {priority} • "
 
         max_title_length = 150 - len(header_prefix)
         if len(title) > max_title_length:
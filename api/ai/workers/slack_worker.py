@@ -10,7 +10,6 @@ import os
 import json
 import time
 import logging
-import yaml
 import sys
 import threading
 from typing import Optional, Dict, Any, List
@@ -40,13 +39,17 @@ class SlackWorker:
         """Initialize the Slack worker"""
         self.setup_config()
         
-        # Initialize collaborators
-        self.repo = SlackRepository(self.config['database_url'])
+        # Collaborators that open connections are created in connect(), on the
+        # worker thread, so constructing the worker never blocks app startup
+        self.repo = None
         self.builder = SlackMessageBuilder(self.config['api_base_url'])
         
         self.socket_handler = None
         self.socket_thread = None
 
+    def connect(self):
+        """Connect to the database and Slack (called once, from run)"""
+        self.repo = SlackRepository(self.config['database_url'])
         self.setup_slack()
         
     def setup_config(self):
@@ -96,9 +99,8 @@ class SlackWorker:
             return {}
 
         try:
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-            return config or {}
+            from config_loader import load_yaml_file
+            return load_yaml_file(config_path) or {}
         except Exception as e:
             logger.error(f"❌ Failed to load config file: {e}")
             return {}
@@ -182,6 +184,16 @@ class SlackWorker:
             logger.warning("⚠️ Slack Worker is disabled due to missing configuration.")
             return
 
+        try:
+            self.connect()
+        except Exception as e:
+            logger.error(f"❌ Slack Worker failed to connect: {e}", exc_info=True)
+            self.enabled = False
+        if not self.enabled:
+            logger.warning("⚠️ Slack Worker is disabled: database or Slack setup failed.")
+            self.cleanup()
+            return
+
         logger.info("🚀 Starting Slack Worker for incident notifications...")
         
         try:
@@ -257,9 +269,7 @@ class SlackWorker:
             self.process_queue_messages('slack_feedback')
             
         except Exception as e:
-            logger.error(f"❌ Error processing notifications: {e}")
-            import traceback
-            logger.error(f"   Stacktrace: {traceback.format_exc()}")
+            logger.error(f"❌ Error processing notifications: {e}", exc_info=True)
     
     def process_queue_messages(self, queue_name: str):
         """Process messages from a specific PGMQ queue"""
@@ -319,9 +329,7 @@ class SlackWorker:
                         self.handle_failed_message(queue_name, msg_id, message, read_ct)
 
                 except Exception as e:
-                    logger.error(f"❌ Error processing message {msg_id}: {e}")
-                    import traceback
-                    logger.error(f"   Stacktrace: {traceback.format_exc()}")
+                    logger.error(f"❌ Error processing message {msg_id}: {e}", exc_info=True)
 
             if messages_processed > 0:
                 logger.info(f"📬 Processed {messages_processed} messages from {queue_name}")
@@ -330,9 +338,7 @@ class SlackWorker:
                 # logger.debug(f"📭 No messages processed from {queue_name} this cycle")
 
         except Exception as e:
-            logger.error(f"❌ Error processing queue {queue_name}: {e}")
-            import traceback
-            logger.error(f"   Stacktrace: {traceback.format_exc()}")
+            logger.error(f"❌ Error processing queue {queue_name}: {e}", exc_info=True)
             
     def process_notification(self, notification_msg: Dict[str, Any]) -> bool:
         """Process a single notification message"""
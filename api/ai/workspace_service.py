@@ -11,12 +11,14 @@ This module handles:
 7. Allowed tools management
 """
 
+import asyncio
 import os
 import json
 import logging
 import re
 import shutil
 import uuid
+from collections import Counter
 from pathlib import Path
 from typing import Dict, Optional, Any, List
 
@@ -74,6 +76,9 @@ def get_user_workspace_path(user_id: str) -> Path:
     """
     Get workspace directory path for user.
 
+    Not memoized: the agent can modify its workspace (e.g. swap the directory
+    for a symlink), so the resolve() containment check must run every call.
+
     Args:
         user_id: User's UUID
 
@@ -198,7 +203,9 @@ def parse_mcp_servers(mcp_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     return mcp_servers
 
 
-async def get_user_mcp_servers(auth_token: str = "", user_id: str = "") -> Dict[str, Any]:
+async def get_user_mcp_servers(
+    auth_token: str = "", user_id: str = "", raise_on_error: bool = False
+) -> Dict[str, Any]:
     """
     Get MCP servers configuration from PostgreSQL database (instant, no lag).
 
@@ -208,6 +215,8 @@ async def get_user_mcp_servers(auth_token: str = "", user_id: str = "") -> Dict[
     Args:
         auth_token: JWT token (for unsecure flow)
         user_id: User ID directly (for secure/Zero-Trust flow, takes priority)
+        raise_on_error: Re-raise database errors instead of returning {}, so
+            callers that cache the result can tell a failure from "no servers"
 
     Returns:
         Dictionary of MCP servers ready to pass to ClaudeAgentOptions
@@ -246,12 +255,18 @@ async def get_user_mcp_servers(auth_token: str = "", user_id: str = "") -> Dict[
     try:
         # Query MCP servers from PostgreSQL using raw SQL
         query = "SELECT * FROM user_mcp_servers WHERE user_id = %s AND status = 'active'"
-        results = execute_query(query, (effective_user_id,), fetch="all")
+        results = await asyncio.to_thread(execute_query, query, (effective_user_id,), fetch="all")
 
         if not results:
             logger.debug(f"ℹ️  No MCP servers found for user {effective_user_id}")
             return {}
 
+        # Rows sharing a server_name silently overwrite each other below - flag them
+        name_counts = Counter(server.get("server_name") for server in results)
+        duplicates = [name for name, count in name_counts.items() if name and count > 1]
+        if duplicates:
+            logger.warning(f"⚠️  Duplicate MCP server names for user {effective_user_id}, last one wins: {duplicates}")
+
         # Convert to MCP server format based on server_type
         mcp_servers = {}
         for server in results:
@@ -286,6 +301,8 @@ async def get_user_mcp_servers(auth_token: str = "", user_id: str = "") -> Dict[
 
     except Exception as e:
         logger.error(f"❌ Failed to load MCP servers from PostgreSQL for user {effective_user_id}: {e}")
+        if raise_on_error:
+            raise
         return {}
 
 
@@ -548,16 +565,18 @@ async def get_user_allowed_tools(user_id: str) -> List[str]:
 
     try:
         # Query user_allowed_tools table using raw SQL
-        result = execute_query(
+        result = await asyncio.to_thread(
+            execute_query,
             "SELECT tool_name FROM user_allowed_tools WHERE user_id = %s",
             (user_id,),
-            fetch="all"
+            fetch="all",
+            cursor_factory=None,  # single column, read positionally
         )
 
         if not result:
             return []
 
-        allowed_tools = [item.get("tool_name") for item in result if item.get("tool_name")]
+        allowed_tools = [tool_name for (tool_name,) in result if tool_name]
         logger.info(f"✅ Loaded {len(allowed_tools)} allowed tools for user {user_id}")
         return allowed_tools
 
@@ -0,0 +1,11 @@
+-- Shared cache of AI incident analyses, keyed by a SHA-256 of model, tenant and prompt.
+-- Lets every AI service replica (and a restarted one) reuse a recent analysis of an
+-- identical alert instead of re-running Claude. Rows older than the service's
+-- cache TTL are ignored on read and pruned on write.
+CREATE TABLE IF NOT EXISTS incident_analysis_cache (
+    prompt_hash TEXT PRIMARY KEY,
+    analysis TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_incident_analysis_cache_created ON incident_analysis_cache(created_at);